@@ -0,0 +1,50 @@
+"""
+A suite of benchmarks of the overhead of clocks, actors and workflows, for comparing the performance of theatre_ag
+between commits.  Run the suite with <code>python -m benchmarks run</code>, and compare two result files with
+<code>python -m benchmarks compare</code>.
+"""
+
+import platform
+import subprocess
+
+from .scenarios import run_scenario, scenario, SCENARIOS
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names=None, scale='quick', repeat=3):
+    """
+    Runs the named scenarios, or all registered scenarios.
+    :return: a machine readable (JSON serializable) dictionary of the results and the environment they were obtained in.
+    """
+    names = sorted(SCENARIOS) if names is None else names
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'scenarios': [run_scenario(name, scale, repeat) for name in names]
+    }
+
+
+def compare(baseline, candidate, threshold=0.1):
+    """
+    Compares the elapsed seconds of the scenarios common to two suite results.
+    :return: a list of (scenario name, baseline seconds, candidate seconds, ratio, regressed) tuples, where a scenario
+    has regressed if the candidate is slower than the baseline by more than the threshold fraction.
+    """
+    baseline_seconds = {result['name']: result['metrics']['seconds'] for result in baseline['scenarios']}
+
+    comparison = list()
+    for result in candidate['scenarios']:
+        name = result['name']
+        if name in baseline_seconds:
+            ratio = result['metrics']['seconds'] / baseline_seconds[name]
+            comparison.append((name, baseline_seconds[name], result['metrics']['seconds'], ratio, ratio > 1 + threshold))
+    return comparison
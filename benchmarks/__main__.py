@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+from . import compare, run_suite, SCENARIOS
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks theatre_ag.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run benchmark scenarios and write the results as JSON')
+    run_parser.add_argument('scenarios', nargs='*', help='any of: ' + ', '.join(sorted(SCENARIOS)))
+    run_parser.add_argument('--scale', choices=['quick', 'full'], default='quick')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout)
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON result files')
+    compare_parser.add_argument('baseline', type=argparse.FileType('r'))
+    compare_parser.add_argument('candidate', type=argparse.FileType('r'))
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == 'run':
+        unknown = set(arguments.scenarios) - set(SCENARIOS)
+        if len(unknown) > 0:
+            parser.error('unknown scenarios: ' + ', '.join(sorted(unknown)))
+        results = run_suite(arguments.scenarios or None, arguments.scale, arguments.repeat)
+        json.dump(results, arguments.output, indent=2)
+        arguments.output.write('\n')
+        return 0
+
+    regressed = False
+    for name, baseline, candidate, ratio, slower in compare(
+            json.load(arguments.baseline), json.load(arguments.candidate), arguments.threshold):
+        print("%-20s %10.4fs %10.4fs %7.2fx%s" % (name, baseline, candidate, ratio, '  REGRESSED' if slower else ''))
+        regressed = regressed or slower
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import time
+import tracemalloc
+
+from theatre_ag import (Cast, default_cost, Episode, Idling, InterClockSynchronization, StopwatchActor,
+                        SynchronizingClock, TaskQueueActor)
+
+
+SCENARIOS = dict()
+
+
+def scenario(**scales):
+    """
+    Registers a benchmark scenario, with the parameters used at each scale of the suite.
+    """
+    def register(function):
+        SCENARIOS[function.__name__] = (function, scales)
+        return function
+    return register
+
+
+class _Timer(object):
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.seconds = time.perf_counter() - self.start
+
+
+class _CallWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(0)
+    def call(self):
+        pass
+
+    @default_cost(0)
+    def call_many(self, calls):
+        for _ in range(0, calls):
+            self.call()
+
+
+class _NestingWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(0)
+    def nest(self, depth):
+        if depth > 0:
+            self.nest(depth - 1)
+
+    @default_cost(0)
+    def nest_repeatedly(self, depth, repetitions):
+        for _ in range(0, repetitions):
+            self.nest(depth)
+
+
+class _TickingWorkflow(object):
+    """
+    Performs one idling task on every tick, so that the actor waits for each tick in turn.
+    """
+
+    is_workflow = True
+
+    def __init__(self):
+        self.idling = Idling()
+
+    @default_cost(0)
+    def idle_every_tick(self, ticks):
+        for _ in range(0, ticks):
+            self.idling.idle()
+
+
+def _perform_single_task(entry_point_name, workflow, args, compact_task_history=False):
+    clock = SynchronizingClock(max_ticks=1)
+    actor = TaskQueueActor(0, clock)
+    actor.compact_task_history = compact_task_history
+    actor.allocate_task(getattr(workflow, entry_point_name), workflow, args)
+    actor.initiate_shutdown()
+
+    with _Timer() as timer:
+        Episode(clock, Cast([actor])).perform()
+        actor.wait_for_shutdown()
+
+    return timer.seconds, actor
+
+
+@scenario(quick={'actors': 10, 'ticks': 50}, full={'actors': 200, 'ticks': 500})
+def clock_ticks(actors, ticks):
+    """
+    Ticks per second issued to a cast of threaded actors that each perform an idling task on every tick, so that every
+    tick costs a handshake between the clock and each actor.
+    """
+    clock = SynchronizingClock(max_ticks=ticks)
+    cast = Cast(TaskQueueActor(name, clock) for name in range(0, actors))
+    for actor in cast.members:
+        actor.initiate_shutdown()
+        workflow = _TickingWorkflow()
+        actor.allocate_task(workflow.idle_every_tick, workflow, [ticks])
+
+    with _Timer() as timer:
+        Episode(clock, cast).perform()
+        cast.wait_for_shutdown()
+
+    return {'seconds': timer.seconds, 'ticks_per_second': ticks / timer.seconds,
+            'actor_ticks_per_second': ticks * actors / timer.seconds}
+
+
+@scenario(quick={'calls': 2000}, full={'calls': 100000})
+def workflow_calls(calls):
+    """
+    The overhead of a tracked workflow method call, compared with a call to the same method on an untracked object.
+    """
+    seconds, _ = _perform_single_task('call_many', _CallWorkflow(), [calls])
+
+    untracked = type('_Untracked', (object,), {'call': lambda self: None})()
+    with _Timer() as untracked_timer:
+        for _ in range(0, calls):
+            untracked.call()
+
+    return {'seconds': seconds, 'microseconds_per_call': seconds * 1e6 / calls,
+            'untracked_microseconds_per_call': untracked_timer.seconds * 1e6 / calls}
+
+
+@scenario(quick={'depth': 50, 'repetitions': 20}, full={'depth': 500, 'repetitions': 200})
+def nested_tasks(depth, repetitions):
+    """
+    The cost of deeply nested sub-tasks, recorded as a task tree.
+    """
+    seconds, actor = _perform_single_task('nest_repeatedly', _NestingWorkflow(), [depth, repetitions])
+    tasks = (depth + 1) * repetitions
+
+    return {'seconds': seconds, 'microseconds_per_task': seconds * 1e6 / tasks, 'tasks': actor.task_count()}
+
+
+@scenario(quick={'seconds': 600}, full={'seconds': 36000})
+def clock_hierarchy(seconds):
+    """
+    A seconds clock driving minutes and hours clocks as parent clocks, through <code>InterClockSynchronization</code>
+    listeners and through <code>StopwatchActor</code>s.
+    """
+    seconds_clock = SynchronizingClock(max_ticks=seconds)
+    minutes_clock = SynchronizingClock()
+    seconds_clock.add_parent_clock(minutes_clock, granularity=60)
+    minutes_clock.add_parent_clock(SynchronizingClock(), granularity=60)
+
+    with _Timer() as parent_clock_timer:
+        seconds_clock.tick_toc()
+
+    seconds_clock = SynchronizingClock(max_ticks=seconds)
+    minutes_clock = SynchronizingClock()
+    seconds_clock.add_tick_listener(InterClockSynchronization(minutes_clock, granularity=60))
+    minutes_clock.add_tick_listener(InterClockSynchronization(SynchronizingClock(), granularity=60))
+
+    with _Timer() as listener_timer:
+        seconds_clock.tick_toc()
+
+    seconds_clock = SynchronizingClock(max_ticks=seconds)
+    minutes_clock = SynchronizingClock()
+    stopwatch = StopwatchActor('seconds', seconds_clock, minutes_clock, 60)
+    stopwatch.initiate_shutdown()
+
+    with _Timer() as stopwatch_timer:
+        Episode(seconds_clock, Cast([stopwatch])).perform()
+        stopwatch.wait_for_shutdown()
+
+    return {'seconds': parent_clock_timer.seconds + listener_timer.seconds + stopwatch_timer.seconds,
+            'parent_clock_ticks_per_second': seconds / parent_clock_timer.seconds,
+            'listener_ticks_per_second': seconds / listener_timer.seconds,
+            'stopwatch_ticks_per_second': seconds / stopwatch_timer.seconds}
+
+
+@scenario(quick={'tasks': 2000}, full={'tasks': 100000})
+def history_memory(tasks):
+    """
+    The memory retained by the task history of an actor, as a task tree and as compact task records.
+    """
+    metrics = dict()
+    total_seconds = 0.0
+    for compact_task_history in (False, True):
+        tracemalloc.start()
+        seconds, actor = _perform_single_task('call_many', _CallWorkflow(), [tasks], compact_task_history)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        label = 'compact' if compact_task_history else 'tree'
+        metrics[label + '_bytes_per_task'] = retained / actor.task_count()
+        total_seconds += seconds
+        del actor
+
+    metrics['seconds'] = total_seconds
+    return metrics
+
+
+def run_scenario(name, scale='quick', repeat=1):
+    """
+    Runs a registered scenario, repeat times, at the given scale.
+    :return: a dictionary describing the scenario's parameters and the best (lowest time) of its repeated results.
+    """
+    function, scales = SCENARIOS[name]
+    parameters = scales[scale]
+    results = [function(**parameters) for _ in range(0, repeat)]
+    return {'name': name, 'parameters': parameters, 'metrics': min(results, key=lambda result: result['seconds'])}
+
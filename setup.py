@@ -10,5 +10,6 @@ setup(
     author='Tim Storer',
     author_email='timothy.storer@glasgow.ac.uk',
     description='A framework for developing agent oriented simulations.',
+    extras_require={'analysis': ['numpy']},
     zip_safe=False
 )
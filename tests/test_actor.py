@@ -1,6 +1,7 @@
+from queue import Empty
 from unittest import TestCase
 
-from theatre_ag import TaskQueueActor, Idling, SynchronizingClock, default_cost
+from theatre_ag import Task, TaskQueueActor, Idling, SynchronizingClock, default_cost
 
 
 class ExampleWorkflow(object):
@@ -23,6 +24,43 @@ class ExampleWorkflow(object):
         raise Exception('An expected exception.')
 
 
+class Dispatcher(object):
+
+    is_workflow = True
+
+    def __init__(self, idling):
+        self.idling = idling
+
+    @default_cost(10)
+    def dispatch(self, recipient):
+        recipient.allocate_task(self.idling.idle, Idling())
+        recipient.initiate_shutdown()
+
+
+class QueueDispatcher(Dispatcher):
+
+    @default_cost(10)
+    def dispatch(self, recipient):
+        idling = Idling()
+        recipient.task_queue.put(Task(idling.idle, idling))
+        recipient.initiate_shutdown()
+
+
+class PollingActor(TaskQueueActor):
+    """
+    Takes a single task from outside its queue, once the clock reaches tick 3.
+    """
+
+    delivered = False
+
+    def get_next_task(self):
+        if self.clock.current_tick >= 3 and not self.delivered:
+            self.delivered = True
+            idling = Idling()
+            return Task(idling.idle, idling)
+        raise Empty()
+
+
 class ActorTestCase(TestCase):
 
     def setUp(self):
@@ -95,7 +133,7 @@ class ActorTestCase(TestCase):
         self.run_clock()
         self.actor.shutdown()
 
-        self.assertEqual(5, len(self.actor._task_history[0].sub_tasks))
+        self.assertEqual(0, len(self.actor._task_history[0].sub_tasks))
         self.assertEqual(None, self.actor._task_history[0].finish_tick)
 
     def test_stateless_task_allocation(self):
@@ -117,6 +155,142 @@ class ActorTestCase(TestCase):
 
         self.assertEqual('task_b()[0->2]', str(self.actor.last_task))
 
+    def test_registered_task_filter(self):
+
+        def is_task_b(task):
+            return task.entry_point_name == 'task_b'
+
+        self.actor.register_task_filter(is_task_b)
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.allocate_task(self.example_workflow.task_b, self.example_workflow)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual(2, self.actor.task_count(is_task_b))
+        self.assertEqual(2, self.actor._recount_tasks(is_task_b))
+        self.assertEqual(5, self.actor.task_count())
+
+    def test_statistics_match_history(self):
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [5])
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual(self.actor.task_history[-1].last_non_idling_tick, self.actor.last_tick)
+        self.assertEqual(self.actor._recount_tasks(None), self.actor.task_count())
+        self.assertIs(self.actor.task_history[-1], self.actor.last_task)
+
+    def test_compact_task_history(self):
+        self.actor.compact_task_history = True
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [5])
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual(['task_a()[0->3]', 'idle_for()[3->?]'], list(map(str, self.actor.task_history)))
+        self.assertEqual('task_b()[1->3]', str(self.actor.task_history[0].sub_tasks[0]))
+        self.assertEqual(4, self.actor.task_count())
+        self.assertEqual(3, self.actor.last_tick)
+
+    def test_idle_for_incurs_single_delay(self):
+        self.clock = SynchronizingClock(max_ticks=100, next_event=True)
+        self.actor = TaskQueueActor(0, self.clock)
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [90])
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual('idle_for(90)[3->93]', str(self.actor.last_task))
+        self.assertEqual(0, len(self.actor.last_task.sub_tasks))
+
+    def test_idle_until_task_completed(self):
+        self.clock = SynchronizingClock(max_ticks=20)
+        self.actor = TaskQueueActor(0, self.clock)
+        delegate = TaskQueueActor(1, self.clock)
+
+        delegated_task = delegate.allocate_task(self.idling.idle_for, Idling(), [5])
+        delegate.initiate_shutdown()
+        delegate.start()
+
+        self.actor.allocate_task(self.idling.wait_for_tasks, self.idling, [[delegated_task]])
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual('idle_for(5)[0->5]', str(delegated_task))
+        self.assertEqual(6, self.actor.last_task.finish_tick)
+        self.assertEqual(6, self.actor.last_task.sub_tasks[0].finish_tick)
+
+    def test_priority_and_deadline_order(self):
+        self.clock = SynchronizingClock(max_ticks=20)
+        self.actor = TaskQueueActor(0, self.clock)
+
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [1], priority=1)
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [2], deadline=5)
+        self.actor.allocate_tasks([(self.idling.idle_for, self.idling, [3]), (self.idling.idle_for, self.idling, [4])])
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [5], deadline=2)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual([5, 2, 3, 4, 1], [task.args[0] for task in self.actor.task_history])
+        self.assertEqual(15, self.actor.last_tick)
+
+    def test_parked_actor_woken_by_allocation(self):
+        self.clock = SynchronizingClock(max_ticks=100, next_event=True)
+        self.actor = TaskQueueActor(0, self.clock)
+        dispatcher = TaskQueueActor(1, self.clock)
+
+        workflow = Dispatcher(Idling())
+        dispatcher.allocate_task(workflow.dispatch, workflow, [self.actor])
+        dispatcher.initiate_shutdown()
+        dispatcher.start()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual('idle()[11->12]', str(self.actor.last_task))
+        # The actor parks once before the allocation, rather than idling on each of the ticks that it waits for.
+        self.assertEqual(['park', 'idle'], [task.entry_point_name for task in self.actor._task_history])
+
+    def test_parked_actor_woken_by_queue_put(self):
+        self.clock = SynchronizingClock(max_ticks=100, next_event=True)
+        self.actor = TaskQueueActor(0, self.clock)
+        dispatcher = TaskQueueActor(1, self.clock)
+
+        workflow = QueueDispatcher(Idling())
+        dispatcher.allocate_task(workflow.dispatch, workflow, [self.actor])
+        dispatcher.initiate_shutdown()
+        dispatcher.start()
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual('idle()[11->12]', str(self.actor.last_task))
+        self.assertEqual(0, self.actor.task_queue.qsize())
+
+    def test_overridden_get_next_task_polled(self):
+        self.clock = SynchronizingClock(max_ticks=6)
+        self.actor = PollingActor(0, self.clock)
+
+        self.run_clock()
+        self.actor.wait_for_shutdown()
+
+        self.assertEqual(['idle()[3->4]'], [str(task) for task in self.actor._task_history
+                                            if task.entry_point_name == 'idle'])
+
     def test_start_twice(self):
         self.actor.start()
         self.actor.start()
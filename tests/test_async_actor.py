@@ -0,0 +1,151 @@
+import asyncio
+import unittest
+
+from theatre_ag import AsyncIdling, AsyncTaskQueueActor, Cast, Episode, SynchronizingClock, default_cost
+
+
+class ExampleWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self, idling):
+        self.idling = idling
+
+    @default_cost(1)
+    async def task_a(self):
+        await self.task_b()
+
+    @default_cost(1)
+    async def task_b(self):
+        await self.idling.idle()
+
+    @default_cost(1)
+    async def task_c(self):
+        raise Exception('An expected exception.')
+
+    @default_cost(0)
+    def task_d(self):
+        return 'd'
+
+
+class AsyncActorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=4)
+        self.actor = AsyncTaskQueueActor(0, self.clock)
+        self.idling = AsyncIdling()
+        self.example_workflow = ExampleWorkflow(self.idling)
+
+    def run_clock(self):
+        async def perform():
+            self.actor.start()
+            self.clock.start_async()
+            await self.clock.wait_for_last_tick_async()
+            await self.actor.wait_for_shutdown()
+
+        asyncio.run(perform())
+
+    def test_explicit_idle(self):
+        self.actor.allocate_task(self.idling.idle, self.idling)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEqual(1, self.actor.last_task.finish_tick)
+
+    def test_idling_when_nothing_to_do(self):
+
+        self.run_clock()
+
+        self.assertEqual(0, len(self.actor.task_history))
+
+    def test_nested_task(self):
+
+        self.actor.allocate_task(self.example_workflow.task_a, self.example_workflow)
+        self.actor.initiate_shutdown()
+
+        self.run_clock()
+
+        self.assertEqual(3, self.actor.last_task.finish_tick)
+
+    def test_encounter_exception_shutdown_cleanly(self):
+
+        self.actor.allocate_task(self.example_workflow.task_c, self.example_workflow)
+
+        self.run_clock()
+
+        self.assertEqual('task_c()[0->1]', str(self.actor.last_task))
+
+    def test_insufficient_time_shutdown_cleanly(self):
+        self.actor.allocate_task(self.idling.idle_for, self.idling, [5])
+
+        self.run_clock()
+
+        self.assertEqual(None, self.actor.last_task.finish_tick)
+
+    def test_idle_until_task_completed(self):
+        delegate = AsyncTaskQueueActor(1, self.clock)
+        delegated_task = delegate.allocate_task(self.idling.idle_for, AsyncIdling(), [2])
+        delegate.initiate_shutdown()
+
+        self.actor.allocate_task(self.idling.idle_until, self.idling, [delegated_task])
+        self.actor.initiate_shutdown()
+
+        async def perform():
+            delegate.start()
+            self.actor.start()
+            self.clock.start_async()
+            await self.clock.wait_for_last_tick_async()
+
+        asyncio.run(perform())
+
+        self.assertEqual('idle_for(2)[0->2]', str(delegated_task))
+        self.assertEqual('idle_until(idle_for(2)[0->2])[0->3]', str(self.actor.last_task))
+
+    def test_parked_actor_woken_by_allocation(self):
+        self.clock = SynchronizingClock(max_ticks=20)
+        self.actor = AsyncTaskQueueActor(0, self.clock)
+
+        async def perform():
+            self.actor.start()
+            self.clock.start_async()
+            while self.clock.current_tick < 5:
+                await asyncio.sleep(0)
+            self.actor.allocate_task(self.idling.idle, self.idling)
+            self.actor.initiate_shutdown()
+            await self.actor.wait_for_shutdown()
+
+        asyncio.run(perform())
+
+        self.assertEqual('idle()[6->7]', str(self.actor.last_task))
+        self.assertEqual(['park', 'idle'], [task.entry_point_name for task in self.actor._task_history])
+
+    def test_synchronous_method_without_cost(self):
+        self.actor.allocate_task(self.example_workflow.task_d, self.example_workflow)
+
+        self.run_clock()
+
+        self.assertEqual('task_d()[0->0]', str(self.actor.last_task))
+
+
+class AsyncEpisodeTestCase(unittest.TestCase):
+
+    def test_many_actors(self):
+        clock = SynchronizingClock(max_ticks=10, next_event=True)
+        cast = Cast()
+
+        for name in range(0, 1000):
+            actor = AsyncTaskQueueActor(name, clock)
+            workflow = ExampleWorkflow(AsyncIdling())
+            actor.allocate_task(workflow.task_a, workflow)
+            actor.initiate_shutdown()
+            cast.add_member(actor)
+
+        asyncio.run(Episode(clock, cast).perform_async())
+
+        self.assertEqual(3, cast.last_tick)
+        self.assertEqual(3000, cast.task_count(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from benchmarks import compare, run_suite, SCENARIOS
+
+
+class BenchmarksTestCase(unittest.TestCase):
+
+    def test_run_suite(self):
+        results = run_suite(sorted(SCENARIOS), repeat=1)
+
+        self.assertEqual(sorted(SCENARIOS), [result['name'] for result in results['scenarios']])
+        for result in results['scenarios']:
+            self.assertGreater(result['metrics']['seconds'], 0)
+
+    def test_compare(self):
+        baseline = {'scenarios': [{'name': 'a', 'metrics': {'seconds': 1.0}},
+                                  {'name': 'b', 'metrics': {'seconds': 1.0}}]}
+        candidate = {'scenarios': [{'name': 'a', 'metrics': {'seconds': 1.05}},
+                                   {'name': 'b', 'metrics': {'seconds': 2.0}},
+                                   {'name': 'c', 'metrics': {'seconds': 1.0}}]}
+
+        self.assertEqual([('a', 1.0, 1.05, 1.05, False), ('b', 1.0, 2.0, 2.0, True)], compare(baseline, candidate))
+
+
+if __name__ == '__main__':
+    unittest.main()
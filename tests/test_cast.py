@@ -1,6 +1,7 @@
+import threading
 import unittest
 
-from theatre_ag import SynchronizingClock, Cast, TaskQueueActor, Idling
+from theatre_ag import ActorThreadCache, SynchronizingClock, Cast, Improv, TaskQueueActor, Idling
 
 
 class TeamTestCase(unittest.TestCase):
@@ -16,6 +17,81 @@ class TeamTestCase(unittest.TestCase):
 
         self.assertEqual(1, len(self.cast.members))
 
+    def test_get_member(self):
+        alice = TaskQueueActor('alice', self.clock)
+        bob = TaskQueueActor('bob', self.clock)
+        self.cast.add_members([alice, bob])
+
+        self.assertIs(alice, self.cast.get_member('alice'))
+        self.assertIsNone(self.cast.get_member('charlie'))
+        self.assertEqual({'alice', 'bob'}, set(self.cast.member_names))
+
+    def test_remove_members(self):
+        alice = TaskQueueActor('alice', self.clock)
+        bob = TaskQueueActor('bob', self.clock)
+        self.cast.add_members([alice, bob])
+
+        self.cast.remove_members([alice])
+
+        self.assertEqual({bob}, self.cast.members)
+        self.assertIsNone(self.cast.get_member('alice'))
+        self.assertIn('bob', self.cast.member_names)
+
+    def test_member_names_snapshot(self):
+        self.cast.add_member(TaskQueueActor('alice', self.clock))
+        member_names = self.cast.member_names
+
+        for name in member_names:
+            self.cast.add_member(TaskQueueActor(name + '2', self.clock))
+
+        self.assertEqual(frozenset({'alice'}), member_names)
+        self.assertEqual(frozenset({'alice', 'alice2'}), self.cast.member_names)
+
+    def test_add_members_while_performing(self):
+        self.clock = SynchronizingClock(max_ticks=5)
+        improv = Improv(self.clock, self.cast)
+        improv.perform()
+
+        actors = [TaskQueueActor(name, self.clock) for name in range(0, 10)]
+        for actor in actors:
+            idle_task = Idling()
+            actor.allocate_task(idle_task.idle, idle_task)
+            actor.initiate_shutdown()
+        improv.add_members(actors)
+
+        self.cast.wait_for_shutdown()
+        self.clock.wait_for_last_tick()
+
+        self.assertEqual(10, self.cast.task_count())
+
+    def test_add_members_to_cached_improvisation(self):
+        self.clock = SynchronizingClock()
+        thread_cache = ActorThreadCache(max_idle_workers=5)
+        improv = Improv(self.clock, self.cast, thread_cache)
+        improv.perform()
+
+        for batch in range(0, 3):
+            actors = [TaskQueueActor((batch, name), self.clock) for name in range(0, 5)]
+            for actor in actors:
+                idling = Idling()
+                actor.allocate_task(idling.idle_for, idling, [2])
+                actor.initiate_shutdown()
+            improv.add_members(actors)
+            for actor in actors:
+                actor.wait_for_shutdown()
+                self.assertFalse(actor.thread.is_alive())
+                self.assertEqual(2, actor.last_task.finish_tick - actor.last_task.start_tick)
+
+        # Idle workers do not keep the actors they last performed.
+        for thread in threading.enumerate():
+            self.assertIsNone(getattr(thread, 'actor', None))
+
+        # The workers of earlier batches are reused by later ones.
+        self.assertLessEqual(thread_cache.workers, 10)
+
+        self.clock.shutdown()
+        thread_cache.shutdown()
+
     def test_multiple_actors(self):
 
         for name in range(0, 10):
@@ -32,6 +108,28 @@ class TeamTestCase(unittest.TestCase):
         for actor in self.cast.members:
             self.assertEqual('idle()[0->1]', str(actor.last_task))
 
+    def test_registered_task_filter(self):
+
+        def is_idle(task):
+            return task.entry_point_name == 'idle'
+
+        for name in range(0, 10):
+            _actor = TaskQueueActor(name, self.clock)
+            self.cast.add_member(_actor)
+            idle_task = Idling()
+            _actor.allocate_task(idle_task.idle, idle_task)
+
+        self.cast.register_task_filter(is_idle)
+
+        self.cast.initiate_shutdown()
+        self.cast.start()
+        self.clock.start()
+        self.cast.wait_for_shutdown()
+
+        self.assertEqual(10, self.cast.task_count(is_idle))
+        self.assertEqual(10, self.cast.task_count())
+        self.assertEqual(1, self.cast.last_tick)
+
     def test_multiple_starts(self):
         self.cast.add_member(TaskQueueActor('alice', self.clock))
         self.cast.start()
@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from theatre_ag import (Cast, CheckpointError, default_cost, Episode, EpisodeCheckpoint, format_task_trees, Idling,
+                        SynchronizingClock, TaskQueueActor)
+
+
+class CountingWorkflow(object):
+
+    is_workflow = True
+
+    def __init__(self):
+        self.count = 0
+
+    @default_cost(3)
+    def count_up(self):
+        self.count += 1
+        self.idling.idle()
+
+
+def build_episode(max_ticks):
+    clock = SynchronizingClock(max_ticks=max_ticks)
+    cast = Cast()
+    for name in ('alice', 'bob'):
+        actor = TaskQueueActor(name, clock)
+        workflow = CountingWorkflow()
+        workflow.idling = Idling()
+        for _ in range(0, 4):
+            actor.allocate_task(workflow.count_up, workflow)
+        cast.add_member(actor)
+    return Episode(clock, cast)
+
+
+def task_trees(cast):
+    return {actor.logical_name: format_task_trees(actor.task_history) for actor in cast.members}
+
+
+class CheckpointTestCase(unittest.TestCase):
+
+    def test_restored_episode_matches_uninterrupted_episode(self):
+        uninterrupted = build_episode(max_ticks=30)
+        uninterrupted.perform()
+        uninterrupted.cast.wait_for_shutdown()
+
+        paused = build_episode(max_ticks=30)
+        paused.perform_until(20)
+        checkpoint = paused.checkpoint()
+        paused.clock.shutdown()
+        paused.cast.wait_for_shutdown()
+
+        self.assertEqual(20, checkpoint.tick)
+
+        for _ in range(0, 2):
+            restored = checkpoint.restore()
+            restored.perform()
+            restored.cast.wait_for_shutdown()
+
+            self.assertEqual(task_trees(uninterrupted.cast), task_trees(restored.cast))
+            self.assertEqual(uninterrupted.cast.last_tick, restored.cast.last_tick)
+            self.assertEqual(4, restored.cast.get_member('alice').task_history[-1].workflow.count)
+
+    def test_continue_paused_episode(self):
+        episode = build_episode(max_ticks=30)
+        episode.perform_until(16)
+        episode.checkpoint()
+        episode.perform()
+        episode.cast.wait_for_shutdown()
+
+        self.assertEqual(16, episode.cast.last_tick)
+        self.assertEqual(16, episode.cast.task_count())
+
+    def test_fork_continuations(self):
+        episode = build_episode(max_ticks=30)
+        episode.perform_until(20)
+        checkpoint = episode.checkpoint()
+        episode.clock.shutdown()
+        episode.cast.wait_for_shutdown()
+
+        forks = [checkpoint.restore(max_ticks=40) for _ in range(0, 2)]
+        alice = forks[0].cast.get_member('alice')
+        workflow = alice.task_history[-1].workflow
+        alice.allocate_task(workflow.count_up, workflow)
+
+        for fork in forks:
+            fork.perform()
+            fork.cast.wait_for_shutdown()
+
+        self.assertEqual(40, forks[0].clock.current_tick)
+        self.assertEqual(5, forks[0].cast.get_member('alice').task_history[-1].workflow.count)
+        self.assertEqual(4, forks[1].cast.get_member('alice').task_history[-1].workflow.count)
+        self.assertEqual('count_up()[20->24]', str(forks[0].cast.get_member('alice').last_task))
+
+    def test_save_and_load(self):
+        episode = build_episode(max_ticks=30)
+        episode.perform_until(20)
+        checkpoint = episode.checkpoint()
+        episode.clock.shutdown()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint')
+            checkpoint.save(path)
+            restored = EpisodeCheckpoint.load(path).restore()
+
+        restored.perform()
+        restored.cast.wait_for_shutdown()
+        self.assertEqual(16, restored.cast.last_tick)
+
+    def test_load_in_another_process(self):
+        episode = build_episode(max_ticks=30)
+        episode.perform_until(20)
+        checkpoint = episode.checkpoint()
+        episode.clock.shutdown()
+
+        script = (
+            "import sys\n"
+            "from theatre_ag import EpisodeCheckpoint\n"
+            "restored = EpisodeCheckpoint.load(sys.argv[1]).restore(max_ticks=40)\n"
+            "alice = restored.cast.get_member('alice')\n"
+            "workflow = alice.task_history[-1].workflow\n"
+            "alice.allocate_task(workflow.count_up, workflow)\n"
+            "restored.perform()\n"
+            "restored.cast.wait_for_shutdown()\n"
+            "print(alice.last_task, workflow.count)\n")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint')
+            checkpoint.save(path)
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            output = subprocess.check_output([sys.executable, '-c', script, path], cwd=root, timeout=60)
+
+        self.assertEqual('count_up()[20->24] 5', output.decode().strip())
+
+    def test_cannot_checkpoint_busy_actors(self):
+        episode = build_episode(max_ticks=30)
+        episode.perform_until(2)
+
+        with self.assertRaises(CheckpointError):
+            episode.checkpoint()
+
+        episode.clock.shutdown()
+        episode.cast.wait_for_shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import Mock
 
-from theatre_ag import SynchronizingClock
+from theatre_ag import SynchronizingClock, TaskQueueActor, default_cost
 
 
 class ClockTestCase(unittest.TestCase):
@@ -18,6 +18,26 @@ class ClockTestCase(unittest.TestCase):
         self.tick_listener.wait_for_tick.assert_called_once_with()
         self.tick_listener.notify_new_tick.assert_called_once_with()
 
+    def test_tick_listener_snapshot(self):
+        self.clock = SynchronizingClock(max_ticks=10)
+        listeners = [Mock() for _ in range(0, 3)]
+        for listener in listeners:
+            self.clock.add_tick_listener(listener)
+
+        snapshot = self.clock.get_cache_of_tick_listeners()
+        self.clock.tick()
+        self.assertIs(snapshot, self.clock.get_cache_of_tick_listeners())
+
+        self.clock.remove_tick_listener(listeners[1])
+        self.clock.tick()
+
+        self.assertEqual((listeners[0], listeners[2]), self.clock.get_cache_of_tick_listeners())
+        self.assertEqual(1, listeners[1].notify_new_tick.call_count)
+        self.assertEqual(2, listeners[2].notify_new_tick.call_count)
+
+        with self.assertRaises(ValueError):
+            self.clock.remove_tick_listener(listeners[1])
+
     def test_ticks_until_stopped(self):
         self.clock = SynchronizingClock()
         self.clock.tick()
@@ -26,6 +46,174 @@ class ClockTestCase(unittest.TestCase):
         self.clock.tick()
         self.assertEqual(self.clock.current_tick, 2)
 
+    def test_next_event_advances_to_earliest_turn(self):
+        self.clock = SynchronizingClock(max_ticks=100, next_event=True)
+
+        early_listener = Mock(next_turn=10)
+        late_listener = Mock(next_turn=50)
+
+        self.clock.add_tick_listener(early_listener)
+        self.clock.add_tick_listener(late_listener)
+
+        self.clock.tick()
+
+        self.assertEqual(self.clock.current_tick, 10)
+
+    def test_next_event_advances_one_tick_for_listeners_without_turns(self):
+        self.clock = SynchronizingClock(max_ticks=100, next_event=True)
+
+        self.clock.add_tick_listener(Mock(next_turn=10))
+        self.clock.add_tick_listener(Mock(spec=['wait_for_tick', 'notify_new_tick']))
+
+        self.clock.tick()
+
+        self.assertEqual(self.clock.current_tick, 1)
+
+    def test_next_event_does_not_pass_max_ticks(self):
+        self.clock = SynchronizingClock(max_ticks=5, next_event=True)
+
+        self.clock.add_tick_listener(Mock(next_turn=10))
+
+        self.clock.tick()
+
+        self.assertEqual(self.clock.current_tick, 5)
+
+    def test_next_event_preserves_task_timing(self):
+
+        @default_cost(1000)
+        def long_task(): pass
+
+        @default_cost(1)
+        def short_task(): pass
+
+        self.clock = SynchronizingClock(max_ticks=2000000, next_event=True)
+        actor = TaskQueueActor('alice', self.clock)
+        actor.allocate_task(long_task)
+        actor.allocate_task(short_task)
+        actor.initiate_shutdown()
+
+        actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+
+        self.assertEqual('long_task()[0->1000]', str(actor.task_history[0]))
+        self.assertEqual('short_task()[1000->1001]', str(actor.task_history[1]))
+
+
+class ParentClockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.seconds_clock = SynchronizingClock(max_ticks=7200)
+        self.minutes_clock = SynchronizingClock()
+        self.hours_clock = SynchronizingClock()
+
+    def test_one_hour_tick_after_3600_seconds(self):
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.minutes_clock.add_parent_clock(self.hours_clock, granularity=60)
+
+        while self.hours_clock.current_tick < 1:
+            self.seconds_clock.tick()
+
+        self.assertEqual(3600, self.seconds_clock.current_tick)
+        self.assertEqual(60, self.minutes_clock.current_tick)
+        self.assertEqual(1, self.hours_clock.current_tick)
+
+    def test_for_handling_imprecision(self):
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.minutes_clock.add_parent_clock(
+            self.hours_clock, granularity=60, precision=lambda granularity: granularity - 5)
+
+        while self.hours_clock.current_tick < 1:
+            self.seconds_clock.tick()
+
+        self.assertEqual(3300, self.seconds_clock.current_tick)
+        self.assertEqual(55, self.minutes_clock.current_tick)
+
+    def test_next_event_child_ticks_parent_for_each_period(self):
+        self.seconds_clock = SynchronizingClock(max_ticks=7200, next_event=True)
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.seconds_clock.add_tick_listener(Mock(next_turn=150))
+
+        self.seconds_clock.tick()
+
+        self.assertEqual(150, self.seconds_clock.current_tick)
+        self.assertEqual(2, self.minutes_clock.current_tick)
+
+    def test_next_event_parent_does_not_pass_child_periods(self):
+        self.seconds_clock = SynchronizingClock(max_ticks=7200, next_event=True)
+        self.minutes_clock = SynchronizingClock(next_event=True)
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.minutes_clock.add_parent_clock(self.hours_clock, granularity=60)
+        self.seconds_clock.add_tick_listener(Mock(next_turn=150))
+        self.minutes_clock.add_tick_listener(Mock(next_turn=100))
+
+        self.seconds_clock.tick()
+
+        self.assertEqual(150, self.seconds_clock.current_tick)
+        self.assertEqual(2, self.minutes_clock.current_tick)
+        self.assertEqual(0, self.hours_clock.current_tick)
+
+    def test_long_child_jump(self):
+        self.seconds_clock = SynchronizingClock(max_ticks=10 ** 7, next_event=True)
+        self.minutes_clock = SynchronizingClock(next_event=True)
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=10)
+        self.minutes_clock.add_parent_clock(self.hours_clock, granularity=60)
+        self.seconds_clock.add_tick_listener(Mock(next_turn=4 * 10 ** 5 + 5))
+
+        self.seconds_clock.tick()
+
+        self.assertEqual(4 * 10 ** 4, self.minutes_clock.current_tick)
+        self.assertEqual(666, self.hours_clock.current_tick)
+
+    def test_actors_on_parent_clock(self):
+
+        @default_cost(2)
+        def task(): pass
+
+        self.seconds_clock = SynchronizingClock(max_ticks=300)
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        actor = TaskQueueActor('alice', self.minutes_clock)
+        actor.allocate_task(task)
+        actor.initiate_shutdown()
+
+        actor.start()
+        self.seconds_clock.start()
+        self.seconds_clock.wait_for_last_tick()
+        actor.wait_for_shutdown()
+
+        self.assertEqual(5, self.minutes_clock.current_tick)
+        self.assertEqual('task()[0->2]', str(actor.last_task))
+
+    def test_parent_clock_stops_with_child(self):
+
+        @default_cost(100)
+        def task(): pass
+
+        self.seconds_clock = SynchronizingClock(max_ticks=300)
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.minutes_clock.add_parent_clock(self.hours_clock, granularity=60)
+        actor = TaskQueueActor('alice', self.minutes_clock)
+        actor.allocate_task(task)
+
+        actor.start()
+        self.seconds_clock.start()
+        self.seconds_clock.wait_for_last_tick()
+        actor.thread.join(timeout=5)
+
+        self.assertFalse(actor.thread.is_alive())
+        self.assertEqual(5, self.minutes_clock.max_ticks)
+        self.assertEqual(0, self.hours_clock.max_ticks)
+        self.assertEqual('task()[0->?]', str(actor.last_task))
+
+    def test_remove_parent_clock(self):
+        self.seconds_clock.add_parent_clock(self.minutes_clock, granularity=60)
+        self.seconds_clock.remove_parent_clock(self.minutes_clock)
+
+        for _ in range(0, 120):
+            self.seconds_clock.tick()
+
+        self.assertEqual(0, self.minutes_clock.current_tick)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import gc
+import unittest
+import weakref
+
+from theatre_ag import CostModel, SynchronizingClock, TaskQueueActor, cost_function, default_cost
+
+
+calls = list()
+
+
+def counted_cost(workflow, distance):
+    calls.append(distance)
+    return distance * workflow.speed
+
+
+class Journey(object):
+
+    is_workflow = True
+
+    def __init__(self, speed=1):
+        self.speed = speed
+
+    @cost_function(counted_cost)
+    def travel(self, distance):
+        pass
+
+    @cost_function(lambda workflow, items: len(items), memoize=False)
+    def carry(self, items):
+        pass
+
+    @default_cost(2)
+    def rest(self):
+        pass
+
+    def look(self):
+        pass
+
+    @default_cost(0)
+    def travel_twice(self, distance):
+        self.travel(distance)
+        self.travel(distance)
+
+
+class Pilgrimage(Journey):
+    pass
+
+
+class CostModelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        del calls[:]
+        self.journey = Journey(speed=2)
+
+    def test_annotated_costs(self):
+        cost_model = CostModel(default=1)
+
+        self.assertEqual(2, cost_model.delay(Journey.rest, self.journey))
+        self.assertEqual(1, cost_model.delay(Journey.look, self.journey))
+        self.assertEqual(6, cost_model.delay(Journey.travel, self.journey, (3,)))
+        self.assertEqual(2, cost_model.delay(Journey.carry, self.journey, ([1, 2],)))
+
+    def test_memoized_cost_function(self):
+        cost_model = CostModel()
+
+        for _ in range(0, 3):
+            self.assertEqual(6, cost_model.delay(Journey.travel, self.journey, (3,)))
+        self.assertEqual(8, cost_model.delay(Journey.travel, self.journey, (4,)))
+
+        self.assertEqual([3, 4], calls)
+
+    def test_memoized_costs_do_not_retain_workflows(self):
+        cost_model = CostModel()
+        journey = Journey()
+        reference = weakref.ref(journey)
+
+        self.assertEqual(3, cost_model.delay(Journey.travel, journey, (3,)))
+        del journey
+        gc.collect()
+
+        self.assertIsNone(reference())
+
+    def test_model_costs_override_annotations(self):
+        cost_model = CostModel({Journey.rest: 5, (Pilgrimage, 'travel'): lambda workflow, distance: 10 * distance})
+        pilgrimage = Pilgrimage()
+
+        self.assertEqual(5, cost_model.delay(Journey.rest, self.journey))
+        self.assertEqual(5, cost_model.delay(Journey.rest, pilgrimage))
+        self.assertEqual(6, cost_model.delay(Journey.travel, self.journey, (3,)))
+        self.assertEqual(30, cost_model.delay(Journey.travel, pilgrimage, (3,)))
+
+    def test_actor_cost_model(self):
+        clock = SynchronizingClock(max_ticks=20)
+        actor = TaskQueueActor(0, clock)
+
+        actor.allocate_task(self.journey.travel_twice, self.journey, [3])
+        actor.initiate_shutdown()
+
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+        actor.wait_for_shutdown()
+
+        self.assertEqual('travel_twice(3)[0->12]', str(actor.last_task))
+        self.assertEqual([3], calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
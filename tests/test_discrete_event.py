@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+
+from theatre_ag import (AsyncIdling, AsyncTaskQueueActor, Cast, DiscreteEventEpisode, Episode, SynchronizingClock,
+                        TaskQueueActor, default_cost, format_task_trees)
+
+
+class Office(object):
+
+    is_workflow = True
+
+    def __init__(self, colleague=None):
+        self.idling = AsyncIdling()
+        self.colleague = colleague
+
+    @default_cost(2)
+    async def write_report(self, pages):
+        for _ in range(0, pages):
+            await self.write_page()
+
+    @default_cost(1)
+    async def write_page(self):
+        pass
+
+    @default_cost(1)
+    async def delegate(self, pages):
+        report = self.colleague.allocate_task(self.write_report, Office(), [pages])
+        await self.idling.idle_until(report)
+        await self.idling.idle_for(3)
+
+
+class Announcer(object):
+
+    is_workflow = True
+
+    def __init__(self, announcements):
+        self.announcements = announcements
+
+    @default_cost(1)
+    async def announce(self, name):
+        self.announcements.append(name)
+
+
+def office_episode(clock):
+    cast = Cast()
+    managers = [AsyncTaskQueueActor('manager %d' % index, clock) for index in range(0, 3)]
+    clerks = [AsyncTaskQueueActor('clerk %d' % index, clock) for index in range(0, 3)]
+    cast.add_members(managers + clerks)
+
+    for index, (manager, clerk) in enumerate(zip(managers, clerks)):
+        workflow = Office(clerk)
+        manager.allocate_task(workflow.delegate, workflow, [index + 1])
+        manager.allocate_task(workflow.write_report, workflow, [2])
+        manager.initiate_shutdown()
+
+    return cast
+
+
+def histories(cast):
+    return {actor.logical_name: (format_task_trees(actor.task_history), actor.last_tick) for actor in cast.members}
+
+
+class DiscreteEventEpisodeTestCase(unittest.TestCase):
+
+    def test_same_histories_as_event_loop(self):
+        for next_event in (False, True):
+            clock = SynchronizingClock(max_ticks=40, next_event=next_event)
+            cast = office_episode(clock)
+            asyncio.run(Episode(clock, cast).perform_async())
+            expected = histories(cast)
+
+            clock = SynchronizingClock(max_ticks=40, next_event=next_event)
+            cast = office_episode(clock)
+            DiscreteEventEpisode(clock, cast).perform()
+
+            self.assertEqual(expected, histories(cast))
+            self.assertEqual(40, clock.current_tick)
+
+        self.assertEqual(15, cast.last_tick)
+
+    def test_ends_when_cast_has_shut_down(self):
+        clock = SynchronizingClock()
+        cast = Cast()
+        for name in ['a', 'b']:
+            actor = AsyncTaskQueueActor(name, clock)
+            workflow = Office()
+            actor.allocate_task(workflow.write_report, workflow, [3])
+            actor.initiate_shutdown()
+            cast.add_member(actor)
+
+        DiscreteEventEpisode(clock, cast).perform()
+
+        self.assertEqual(5, cast.last_tick)
+        self.assertEqual(5, clock.current_tick)
+
+    def test_clock_reusable_after_episode(self):
+        clock = SynchronizingClock(max_ticks=10)
+        DiscreteEventEpisode(clock, office_episode(clock)).perform()
+
+        clock.max_ticks = 50
+        cast = office_episode(clock)
+        asyncio.run(asyncio.wait_for(Episode(clock, cast).perform_async(), 5))
+
+        self.assertEqual(50, clock.current_tick)
+        self.assertEqual(25, cast.last_tick)
+
+    def announcements(self, seed):
+        clock = SynchronizingClock(max_ticks=5)
+        announcements = list()
+        cast = Cast()
+        for name in ['d', 'b', 'a', 'c']:
+            actor = AsyncTaskQueueActor(name, clock)
+            workflow = Announcer(announcements)
+            actor.allocate_task(workflow.announce, workflow, [name])
+            cast.add_member(actor)
+
+        DiscreteEventEpisode(clock, cast, seed=seed).perform()
+        return announcements
+
+    def test_intra_tick_order(self):
+        self.assertEqual(['a', 'b', 'c', 'd'], self.announcements(None))
+        self.assertEqual(self.announcements(7), self.announcements(7))
+        self.assertEqual(['a', 'b', 'c', 'd'], sorted(self.announcements(7)))
+
+    def test_threaded_actors_rejected(self):
+        clock = SynchronizingClock(max_ticks=5)
+
+        with self.assertRaises(TypeError):
+            DiscreteEventEpisode(clock, Cast([TaskQueueActor('a', clock)])).perform()
+
+
+if __name__ == '__main__':
+    unittest.main()
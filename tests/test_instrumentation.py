@@ -0,0 +1,80 @@
+import io
+import json
+import time
+import unittest
+
+from theatre_ag import (Cast, ClockInstrumentation, default_cost, Episode, InterClockSynchronization,
+                        LatencyHistogram, SynchronizingClock, TaskQueueActor)
+
+
+class SlowWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def work(self, seconds):
+        time.sleep(seconds)
+
+
+class LatencyHistogramTestCase(unittest.TestCase):
+
+    def test_record(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.000001, 0.000003, 0.000003, 0.001):
+            histogram.record(seconds)
+
+        self.assertEqual({2: 1, 4: 2, 1024: 1}, histogram.counts)
+        self.assertEqual(0.000004, histogram.percentile(50))
+        self.assertEqual(0.001024, histogram.percentile(100))
+        self.assertEqual(0.001, histogram.maximum)
+
+
+class ClockInstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.instrumentation = ClockInstrumentation(record_ticks=True)
+        self.clock = SynchronizingClock(max_ticks=5, instrumentation=self.instrumentation)
+
+    def test_straggler_and_busy_time(self):
+        cast = Cast()
+        for name, seconds in (('fast', 0.0), ('slow', 0.02)):
+            actor = TaskQueueActor(name, self.clock)
+            for _ in range(0, 3):
+                workflow = SlowWorkflow()
+                actor.allocate_task(workflow.work, workflow, [seconds])
+            actor.initiate_shutdown()
+            cast.add_member(actor)
+
+        Episode(self.clock, cast).perform()
+        cast.wait_for_shutdown()
+
+        self.assertEqual(5, self.instrumentation.tick_latency.count)
+        self.assertEqual([0, 1, 2, 3, 4], [timing.tick for timing in self.instrumentation.tick_timings])
+        self.assertEqual(['slow', 'slow'], [timing.straggler for timing in self.instrumentation.tick_timings[1:3]])
+
+        # The fast actor spends the slow actor's busy time blocked waiting for ticks.
+        busy_seconds = self.instrumentation.busy_seconds
+        blocked_seconds = self.instrumentation.blocked_seconds
+        self.assertLess(busy_seconds['fast'], busy_seconds['slow'])
+        self.assertGreater(blocked_seconds['fast'], blocked_seconds['slow'])
+
+    def test_slowest_listener(self):
+        minutes_clock = SynchronizingClock()
+        self.clock.add_tick_listener(InterClockSynchronization(minutes_clock, granularity=60))
+
+        self.clock.tick_toc()
+
+        self.assertEqual(5, sum(self.instrumentation.slowest_listener_counts.values()))
+
+        stream = io.StringIO()
+        self.instrumentation.write_json(stream)
+        exported = json.loads(stream.getvalue())
+        self.assertEqual(5, exported['tick_latency']['count'])
+        self.assertEqual(5, len(exported['ticks']))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(SynchronizingClock().instrumentation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from theatre_ag import Cast, ShardedEpisode, ShardError, TaskQueueActor, default_cost
+
+
+class Relay(object):
+
+    is_workflow = True
+
+    def __init__(self, route):
+        self.route = route
+
+    @default_cost(1)
+    def hop(self):
+        if len(self.route) > 0:
+            router = self.actor.clock.router
+            router.allocate_task(self.route[0], Relay.hop, Relay(self.route[1:]))
+
+
+class BoundRelay(Relay):
+
+    @default_cost(1)
+    def hop(self):
+        if len(self.route) > 0:
+            self.actor.clock.router.allocate_task(self.route[0], BoundRelay(self.route[1:]).hop)
+
+
+def alternate(logical_name, shards):
+    return int(logical_name[1:]) % shards
+
+
+ROUTE = ['a1', 'a2', 'a3', 'a2']
+
+
+def relay_shard(shard, clock, router):
+    cast = Cast()
+    for name in ['a0', 'a1', 'a2', 'a3']:
+        if router.owns(name):
+            cast.add_member(TaskQueueActor(name, clock))
+
+    if router.owns('a0'):
+        workflow = Relay(ROUTE)
+        cast.get_member('a0').allocate_task(workflow.hop, workflow)
+
+    return cast, None
+
+
+def bound_relay_shard(shard, clock, router):
+    cast = Cast()
+    for name in ['a0', 'a1', 'a2', 'a3']:
+        if router.owns(name):
+            cast.add_member(TaskQueueActor(name, clock))
+
+    if router.owns('a0'):
+        workflow = BoundRelay(ROUTE)
+        cast.get_member('a0').allocate_task(workflow.hop, workflow)
+
+    return cast, None
+
+
+def misdirected_shard(shard, clock, router):
+    cast = Cast()
+    if router.owns('a0'):
+        workflow = Relay(['a5'])
+        cast.add_member(TaskQueueActor('a0', clock))
+        cast.get_member('a0').allocate_task(workflow.hop, workflow)
+    return cast, None
+
+
+def failing_shard(shard, clock, router):
+    if shard == 1:
+        raise ValueError('An expected exception.')
+    return Cast([TaskQueueActor('a0', clock)]), None
+
+
+class ShardedEpisodeTestCase(unittest.TestCase):
+
+    def test_relay_across_shards(self):
+        summaries = ShardedEpisode(relay_shard, 2, max_ticks=20, placement=alternate).perform()
+
+        self.assertEqual({'a0', 'a2'}, set(summaries[0]['actors']))
+        self.assertEqual({'a1', 'a3'}, set(summaries[1]['actors']))
+
+        actors = dict(summaries[0]['actors'], **summaries[1]['actors'])
+        # Each hop takes one tick, and the next hop starts on the tick after the hop is allocated.
+        self.assertEqual(
+            {'a0': 1, 'a1': 3, 'a3': 7, 'a2': 9}, {name: actor['last_tick'] for name, actor in actors.items()})
+        self.assertEqual(2, actors['a2']['task_count'])
+        self.assertEqual(5, summaries[0]['task_count'] + summaries[1]['task_count'])
+
+    def test_relay_across_shards_in_next_event_mode(self):
+        summaries = ShardedEpisode(relay_shard, 3, max_ticks=20, next_event=True, placement=alternate).perform()
+
+        self.assertEqual(5, sum(summary['task_count'] for summary in summaries))
+        self.assertEqual(9, max(summary['last_tick'] for summary in summaries))
+
+    def test_relay_bound_methods_across_shards(self):
+        summaries = ShardedEpisode(bound_relay_shard, 2, max_ticks=20, placement=alternate).perform()
+
+        self.assertEqual(5, sum(summary['task_count'] for summary in summaries))
+        self.assertEqual(9, max(summary['last_tick'] for summary in summaries))
+
+    def test_undeliverable_task(self):
+        with self.assertRaises(ShardError) as context:
+            ShardedEpisode(misdirected_shard, 2, max_ticks=20, placement=alternate).perform()
+
+        self.assertEqual(1, context.exception.shard)
+        self.assertIn('AttributeError', context.exception.details)
+
+    def test_failing_shard(self):
+        with self.assertRaises(ShardError) as context:
+            ShardedEpisode(failing_shard, 2, max_ticks=5).perform()
+
+        self.assertEqual(1, context.exception.shard)
+        self.assertIn('An expected exception.', context.exception.details)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import functools
+import unittest
+
+from theatre_ag import Cast, Idling, summarise_cast, Sweep, SynchronizingClock, TaskQueueActor
+
+
+def idling_episode(configuration):
+    clock = SynchronizingClock(max_ticks=configuration['max_ticks'])
+    cast = Cast()
+    for name in range(0, configuration['actors']):
+        actor = TaskQueueActor(name, clock)
+        idling = Idling()
+        actor.allocate_task(idling.idle_for, idling, [configuration['duration']])
+        actor.initiate_shutdown()
+        cast.add_member(actor)
+    return clock, cast, None
+
+
+def episode_without_end(configuration):
+    clock = SynchronizingClock(max_ticks=None)
+    return clock, Cast([TaskQueueActor('alice', clock)]), None
+
+
+def failing_episode(configuration):
+    raise ValueError('An expected exception.')
+
+
+class SweepTestCase(unittest.TestCase):
+
+    def test_sweep(self):
+        configurations = [{'max_ticks': 10, 'actors': actors, 'duration': duration}
+                          for actors in (1, 3) for duration in (2, 4)]
+
+        results = Sweep(idling_episode, configurations, processes=2).perform()
+
+        self.assertEqual([0, 1, 2, 3], [result.index for result in results])
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual([2, 4, 2, 4], [result.summary['last_tick'] for result in results])
+        self.assertEqual([1, 1, 3, 3], [result.summary['task_count'] for result in results])
+
+    def test_sweep_with_traces(self):
+        summarise = functools.partial(summarise_cast, traces=True)
+
+        [result] = Sweep(idling_episode, [{'max_ticks': 5, 'actors': 1, 'duration': 1}], summarise=summarise).perform()
+
+        self.assertEqual('----> idle_for(1)[0->1]\n', result.summary['actors'][0]['trace'])
+
+    def test_run_timeout_and_failure(self):
+        results = list(Sweep(episode_without_end, [None], timeout=0.5).results())
+        results += Sweep(failing_episode, [None]).perform()
+
+        self.assertTrue(results[0].timed_out)
+        self.assertFalse(results[0].succeeded)
+        self.assertIn('An expected exception.', results[1].error)
+
+
+if __name__ == '__main__':
+    unittest.main()
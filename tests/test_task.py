@@ -1,6 +1,8 @@
 import unittest
 
-from theatre_ag.task import Task
+from io import StringIO
+
+from theatre_ag.task import Task, TaskRecords, format_task_trees, write_task_trees
 from theatre_ag.workflow import Idling
 
 
@@ -135,6 +137,156 @@ class TaskTestCase(unittest.TestCase):
 
         self.assertEqual(3, self.task.last_non_idling_tick)
 
+    def test_completion_callbacks(self):
+        completed = list()
+        self.task.add_completion_callback(completed.append)
+        self.task.initiate(1)
+        self.assertEqual([], completed)
+
+        self.task.complete(4)
+        self.task.add_completion_callback(completed.append)
+
+        self.assertEqual([self.task, self.task], completed)
+
+
+class TaskTreeFormattingTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        def example_task(): pass
+
+        idling = Idling()
+
+        self.task = Task(example_task)
+        self.task.initiate(0)
+
+        sub_task = self.task.append_sub_task(example_sub_task)
+        sub_task.initiate(0)
+        nested_task = sub_task.append_sub_task(example_task)
+        nested_task.initiate(0)
+        nested_task.complete(1)
+        nested_task = sub_task.append_sub_task(example_sub_task)
+        nested_task.initiate(1)
+        nested_task.complete(2)
+        sub_task.complete(2)
+
+        for tick in range(2, 5):
+            idling_sub_task = self.task.append_sub_task(Idling.idle, idling)
+            idling_sub_task.initiate(tick)
+            idling_sub_task.complete(tick + 1)
+
+        sub_task = self.task.append_sub_task(example_sub_task)
+        sub_task.initiate(5)
+        nested_task = sub_task.append_sub_task(example_task)
+        nested_task.initiate(5)
+
+    def test_format_task_trees(self):
+        self.assertEqual(
+            "--+-> example_task()[0->?]\n"
+            "  +-+-> example_sub_task()[0->2]\n"
+            "  | +---> example_task()[0->1]\n"
+            "  | +---> example_sub_task()[1->2]\n"
+            "  +---> idle()[2->3]\n"
+            "  +---> idle()[3->4]\n"
+            "  +---> idle()[4->5]\n"
+            "  +-+-> example_sub_task()[5->?]\n"
+            "    +---> example_task()[5->?]\n"
+            "+-+-> example_sub_task()[0->2]\n"
+            "| +---> example_task()[0->1]\n"
+            "| +---> example_sub_task()[1->2]\n",
+            format_task_trees([self.task, self.task.sub_tasks[0]]))
+
+    def test_write_with_max_depth(self):
+        stream = StringIO()
+        write_task_trees([self.task], stream, max_depth=1)
+
+        self.assertEqual(
+            "--+-> example_task()[0->?]\n"
+            "  +-+-> example_sub_task()[0->2]\n"
+            "  +---> idle()[2->3]\n"
+            "  +---> idle()[3->4]\n"
+            "  +---> idle()[4->5]\n"
+            "  +-+-> example_sub_task()[5->?]\n",
+            stream.getvalue())
+
+    def test_write_eliding_idling(self):
+        stream = StringIO()
+        write_task_trees([self.task], stream, max_depth=1, elide_idling=True)
+
+        self.assertEqual(
+            "--+-> example_task()[0->?]\n"
+            "  +-+-> example_sub_task()[0->2]\n"
+            "  +---> idle()[2->5] x3\n"
+            "  +-+-> example_sub_task()[5->?]\n",
+            stream.getvalue())
+
+    def test_write_deep_tree(self):
+        task = self.task
+        for tick in range(0, 5000):
+            task = task.append_sub_task(example_sub_task)
+            task.initiate(tick)
+
+        stream = StringIO()
+        write_task_trees([self.task], stream)
+
+        self.assertEqual(5009, len(stream.getvalue().splitlines()))
+
+
+class TaskRecordsTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        def example_task(): pass
+
+        self.records = TaskRecords()
+
+        root = self.records.initiate(example_task, 1)
+        first = self.records.initiate(example_sub_task, 2, root)
+        self.records.complete(first, 3)
+        second = self.records.initiate(example_sub_task, 3, root)
+        nested = self.records.initiate(Idling.idle, 3, second)
+        self.records.complete(nested, 4)
+        self.records.complete(second, 4)
+        self.records.complete(root, 5)
+
+        self.records.initiate(example_task, 5)
+
+        self.task = Task(example_task)
+        self.task.initiate(1)
+        sub_task = self.task.append_sub_task(example_sub_task)
+        sub_task.initiate(2)
+        sub_task.complete(3)
+        sub_task = self.task.append_sub_task(example_sub_task)
+        sub_task.initiate(3)
+        nested_task = sub_task.append_sub_task(Idling.idle, Idling)
+        nested_task.initiate(3)
+        nested_task.complete(4)
+        sub_task.complete(4)
+        self.task.complete(5)
+
+    def test_root_views(self):
+        roots = self.records.root_views
+
+        self.assertEqual(['example_task()[1->5]', 'example_task()[5->?]'], list(map(str, roots)))
+        self.assertEqual(5, roots[1].last_non_idling_tick)
+
+    def test_sub_task_views(self):
+        sub_tasks = self.records.root_views[0].sub_tasks
+
+        self.assertEqual(['example_sub_task()[2->3]', 'example_sub_task()[3->4]'], list(map(str, sub_tasks)))
+        self.assertEqual(['idle()[3->4]'], list(map(str, sub_tasks[1].sub_tasks)))
+        self.assertEqual(self.records.root_views[0], sub_tasks[1].parent)
+        self.assertFalse(sub_tasks[0].is_last_sibling)
+        self.assertTrue(sub_tasks[1].is_last_sibling)
+        self.assertEqual(2, sub_tasks[1].sub_tasks[0].depth)
+
+    def test_format_as_task(self):
+        self.assertEqual(format_task_trees([self.task]), format_task_trees(self.records.root_views[0:1]))
+
+    def test_entry_points_interned(self):
+        self.assertEqual(3, len(self.records.entry_points))
+        self.assertEqual(5, len(self.records))
+
 
 if __name__ == '__main__':
     unittest.main()
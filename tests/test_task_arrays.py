@@ -0,0 +1,85 @@
+import unittest
+
+from theatre_ag import (Cast, count_tasks_by, default_cost, Episode, select_tasks, SynchronizingClock, task_array,
+                        task_durations, TaskQueueActor, total_duration_by, utilization)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Kitchen(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def cook(self, courses):
+        for _ in range(0, courses):
+            self.prepare()
+            self.serve()
+
+    @default_cost(2)
+    def prepare(self):
+        pass
+
+    @default_cost(1)
+    def serve(self):
+        pass
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed.')
+class TaskArrayTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=10)
+        self.cast = Cast()
+
+        for name, courses, compact in (('chef', 2, False), ('cook', 1, True), ('porter', 0, False)):
+            actor = TaskQueueActor(name, self.clock)
+            actor.compact_task_history = compact
+            if courses > 0:
+                kitchen = Kitchen()
+                actor.allocate_task(kitchen.cook, kitchen, [courses])
+            actor.initiate_shutdown()
+            self.cast.add_member(actor)
+
+        kitchen = Kitchen()
+        self.cast.get_member('chef').allocate_task(kitchen.cook, kitchen, [3])
+
+        Episode(self.clock, self.cast).perform()
+        self.cast.wait_for_shutdown()
+
+        self.tasks = task_array(self.cast)
+
+    def test_task_array(self):
+        self.assertEqual(self.cast.task_count(), len(self.tasks))
+        self.assertEqual(['chef'] * 8 + ['cook'] * 3, self.tasks['actor'].tolist())
+        self.assertEqual(['cook', 'prepare', 'serve', 'prepare', 'serve'], self.tasks['entry_point_name'][:5].tolist())
+        self.assertEqual([-1, 0, 0, 0, 0, -1, 5, 5], self.tasks['parent'][:8].tolist())
+        self.assertEqual([-1, 8, 8], self.tasks['parent'][8:].tolist())
+        self.assertEqual([0, 1, 1], self.tasks['depth'][8:].tolist())
+        self.assertEqual([0, 1, 3], self.tasks['start_tick'][8:].tolist())
+        self.assertEqual([4, 3, 4], self.tasks['finish_tick'][8:].tolist())
+
+    def test_single_actor(self):
+        chef = self.cast.get_member('chef')
+        self.assertEqual(chef.task_count(), len(task_array(chef)))
+        self.assertEqual(0, len(task_array([self.cast.get_member('porter')])))
+
+    def test_queries(self):
+        self.assertEqual({'cook': 3, 'prepare': 4, 'serve': 4}, count_tasks_by(self.tasks, 'entry_point_name'))
+
+        incomplete = select_tasks(self.tasks, completed=False)
+        self.assertEqual(['cook', 'serve'], incomplete['entry_point_name'].tolist())
+        self.assertEqual([-1, -1], task_durations(incomplete).tolist())
+
+        prepared = select_tasks(self.tasks, actor=['chef', 'cook'], entry_point_name='prepare', depth=1)
+        self.assertEqual([2, 2, 2, 2], task_durations(prepared).tolist())
+
+        self.assertEqual({'cook': 11, 'prepare': 8, 'serve': 3}, total_duration_by(self.tasks, 'entry_point_name'))
+        self.assertEqual({'chef': 0.7, 'cook': 0.4}, utilization(self.tasks, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
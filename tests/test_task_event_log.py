@@ -0,0 +1,80 @@
+import json
+import unittest
+
+from io import BytesIO, StringIO
+
+from theatre_ag import BinaryTaskEventLog, JsonLinesTaskEventLog, SynchronizingClock, TaskQueueActor, \
+    read_binary_task_events, default_cost
+
+
+class ExampleWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def task_a(self):
+        self.task_b()
+
+    @default_cost(1)
+    def task_b(self):
+        pass
+
+
+class TaskEventLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=4)
+        self.actor = TaskQueueActor('alice', self.clock)
+        self.workflow = ExampleWorkflow()
+
+    def perform(self, task_event_log):
+        self.actor.task_event_log = task_event_log
+        self.actor.allocate_task(self.workflow.task_a, self.workflow)
+        self.actor.initiate_shutdown()
+
+        self.actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+        self.actor.wait_for_shutdown()
+
+        task_event_log.flush()
+
+    def test_json_lines(self):
+        stream = StringIO()
+        self.perform(JsonLinesTaskEventLog(stream, batch_size=3))
+
+        events = list(map(json.loads, stream.getvalue().splitlines()))
+
+        self.assertEqual([
+            {'actor': 'alice', 'event': 'initiated', 'task': 'task_a', 'tick': 0, 'depth': 0},
+            {'actor': 'alice', 'event': 'initiated', 'task': 'task_b', 'tick': 1, 'depth': 1},
+            {'actor': 'alice', 'event': 'completed', 'tick': 2, 'depth': 1},
+            {'actor': 'alice', 'event': 'completed', 'tick': 2, 'depth': 0}],
+            events)
+
+    def test_binary(self):
+        stream = BytesIO()
+        self.perform(BinaryTaskEventLog(stream))
+        stream.seek(0)
+
+        self.assertEqual([
+            ('initiated', 'alice', 'task_a', 0, 0),
+            ('initiated', 'alice', 'task_b', 1, 1),
+            ('completed', 'alice', None, 2, 1),
+            ('completed', 'alice', None, 2, 0)],
+            list(read_binary_task_events(stream)))
+
+    def test_without_task_history(self):
+        self.actor.record_task_history = False
+        stream = StringIO()
+        self.perform(JsonLinesTaskEventLog(stream))
+
+        self.assertEqual(4, len(stream.getvalue().splitlines()))
+        self.assertEqual(0, len(self.actor.task_history))
+        self.assertEqual('task_a()[0->2]', str(self.actor.last_task))
+        self.assertEqual(2, self.actor.task_count())
+        self.assertEqual(2, self.actor.last_tick)
+
+
+if __name__ == '__main__':
+    unittest.main()
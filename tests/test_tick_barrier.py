@@ -0,0 +1,97 @@
+import time
+import unittest
+
+from threading import Thread
+from unittest.mock import Mock
+
+from theatre_ag import TickBarrier
+
+
+class TickBarrierTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.barrier = TickBarrier()
+        self.released = list()
+
+    def start_party(self, party, sleep=False):
+        self.barrier.register(party)
+
+        def arrive():
+            self.barrier.arrive(party if sleep else None)
+            self.released.append(party)
+
+        thread = Thread(target=arrive)
+        thread.start()
+        return thread
+
+    def test_wait_for_arrivals_without_parties(self):
+        self.barrier.wait_for_arrivals()
+
+    def test_release_all_arrived_parties(self):
+        threads = [self.start_party(party) for party in range(0, 10)]
+
+        self.barrier.wait_for_arrivals()
+        self.assertEqual(0, len(self.released))
+        self.barrier.release()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(set(range(0, 10)), set(self.released))
+
+    def test_deregistered_party_is_not_waited_for(self):
+        thread = self.start_party('alice')
+        self.barrier.register('bob')
+        self.barrier.deregister('bob')
+
+        self.barrier.wait_for_arrivals()
+        self.barrier.release()
+        thread.join()
+
+        self.assertEqual(['alice'], self.released)
+
+    def test_close_releases_parties(self):
+        thread = self.start_party('alice')
+
+        self.barrier.close()
+        thread.join()
+        self.barrier.arrive()
+
+        self.assertEqual(['alice'], self.released)
+
+    def test_sleeping_parties_woken_at_their_turns(self):
+        early, late = Mock(next_turn=2), Mock(next_turn=10)
+        threads = [self.start_party(early, sleep=True), self.start_party(late, sleep=True)]
+
+        for tick in (1, 2):
+            self.barrier.wait_for_arrivals()
+            self.barrier.release(tick)
+        threads[0].join()
+        self.assertEqual([early], self.released)
+
+        # The late party still counts as arrived, although it is not woken.
+        self.barrier.deregister(early)
+        self.barrier.wait_for_arrivals()
+
+        late.next_turn = 3
+        self.barrier.reschedule(late)
+        self.barrier.release(3)
+        threads[1].join()
+
+        self.assertEqual([early, late], self.released)
+
+    def test_release_without_tick_wakes_sleeping_parties(self):
+        thread = self.start_party(Mock(next_turn=float('inf')), sleep=True)
+        self.barrier.wait_for_arrivals()
+
+        self.barrier.release(100)
+        time.sleep(0.01)
+        self.assertEqual(0, len(self.released))
+
+        self.barrier.release()
+        thread.join()
+        self.assertEqual(1, len(self.released))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from theatre_ag import SynchronizingClock, TaskQueueActor, TracePolicy, default_cost, trace_with
+
+
+class Errand(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def step(self):
+        pass
+
+    @default_cost(1)
+    def walk(self):
+        self.step()
+        self.step()
+
+    @trace_with(TracePolicy(max_depth=0))
+    @default_cost(1)
+    def glance(self):
+        pass
+
+    @default_cost(0)
+    def run_errand(self):
+        self.walk()
+        self.glance()
+        self.walk()
+
+
+class QuietErrand(Errand):
+
+    trace_policy = TracePolicy(excluded=['walk'])
+
+
+class TracePolicyTestCase(unittest.TestCase):
+
+    def run_errand(self, errand, trace_policy=None):
+        clock = SynchronizingClock(max_ticks=20)
+        actor = TaskQueueActor(0, clock)
+        actor.trace_policy = trace_policy
+
+        actor.allocate_task(errand.run_errand, errand)
+        actor.initiate_shutdown()
+
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+        actor.wait_for_shutdown()
+        return actor
+
+    def test_method_policy(self):
+        actor = self.run_errand(Errand())
+
+        task = actor.last_task
+        self.assertEqual(['walk', 'walk'], [sub_task.entry_point_name for sub_task in task.sub_tasks])
+        self.assertEqual(['step', 'step'], [sub_task.entry_point_name for sub_task in task.sub_tasks[0].sub_tasks])
+        self.assertEqual(7, task.finish_tick)
+
+    def test_actor_max_depth(self):
+        actor = self.run_errand(Errand(), TracePolicy(max_depth=1))
+
+        task = actor.last_task
+        self.assertEqual(['walk', 'walk'], [sub_task.entry_point_name for sub_task in task.sub_tasks])
+        self.assertEqual([], task.sub_tasks[0].sub_tasks)
+        self.assertEqual((4, 7), (task.sub_tasks[1].start_tick, task.sub_tasks[1].finish_tick))
+        self.assertEqual(7, task.finish_tick)
+
+    def test_workflow_policy_excludes_calls_within_excluded_method(self):
+        actor = self.run_errand(QuietErrand(), TracePolicy(excluded=[Errand.step]))
+
+        task = actor.last_task
+        self.assertEqual([], task.sub_tasks)
+        self.assertEqual(7, task.finish_tick)
+
+    def test_sampled_calls(self):
+        policy = TracePolicy(sample_rate=0.5, seed=1)
+        sampled = [policy.traces(Errand.step, 1) for _ in range(0, 1000)]
+
+        self.assertTrue(400 < sampled.count(True) < 600)
+        replica = TracePolicy(sample_rate=0.5, seed=1)
+        self.assertEqual(sampled, [replica.traces(Errand.step, 1) for _ in range(0, 1000)])
+        self.assertTrue(TracePolicy(sample_rate=0.0).traces(Errand.run_errand, 1) is False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+
+from theatre_ag import Idling, SynchronizingClock, Task, TaskQueueActor, default_cost
+from theatre_ag.workflow import allocate_workflow_to, treat_as_workflow
+
+
+class BaseWorkflow(object):
+
+    is_workflow = True
+
+    @default_cost(1)
+    def task_a(self):
+        return self.task_b()
+
+    @default_cost(2)
+    def task_b(self):
+        return 'b'
+
+
+class ExampleWorkflow(BaseWorkflow):
+
+    def __init__(self):
+        self.value = 1
+        self.idling = Idling()
+
+    @default_cost(3)
+    def task_c(self):
+        return self.value
+
+
+class PropertyWorkflow(object):
+
+    is_workflow = True
+
+    evaluations = 0
+
+    def __init__(self):
+        self._idling = Idling()
+
+    @property
+    def idling(self):
+        PropertyWorkflow.evaluations += 1
+        return self._idling
+
+
+class InspectingActor(TaskQueueActor):
+
+    def calculate_delay(self, entry_point, workflow=None, args=()):
+        self.entry_points.append(entry_point)
+        return super(InspectingActor, self).calculate_delay(entry_point, workflow, args)
+
+
+class WorkflowTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = SynchronizingClock(max_ticks=10)
+        self.actor = TaskQueueActor('alice', self.clock)
+        self.workflow = ExampleWorkflow()
+
+    def test_task_methods_synchronized_once_per_class(self):
+        allocate_workflow_to(self.actor, self.workflow)
+        task_c = ExampleWorkflow.__dict__['task_c']
+
+        allocate_workflow_to(self.actor, ExampleWorkflow())
+        treat_as_workflow(ExampleWorkflow)
+
+        self.assertTrue(task_c.synchronized)
+        self.assertIs(task_c, ExampleWorkflow.__dict__['task_c'])
+        self.assertIs(task_c, self.workflow.task_c.__func__)
+
+    def test_inherited_task_methods_synchronized(self):
+        allocate_workflow_to(self.actor, self.workflow)
+
+        self.assertTrue(self.workflow.task_a.synchronized)
+        self.assertEqual(1, self.workflow.task_a.default_cost)
+        self.assertEqual('task_b', self.workflow.task_b.__name__)
+
+    def test_data_attributes_unaffected(self):
+        allocate_workflow_to(self.actor, self.workflow)
+
+        self.assertIs(object.__getattribute__, ExampleWorkflow.__getattribute__)
+        self.assertEqual(1, self.workflow.value)
+
+    def test_invocation_without_actor(self):
+        allocate_workflow_to(self.actor, self.workflow)
+
+        self.assertEqual('b', self.workflow.task_a())
+        self.assertEqual(1, self.workflow.task_c())
+
+    def test_idling_without_actor(self):
+        idling = Idling()
+        completed_task, incomplete_task = Task(idling.idle, idling), Task(idling.idle, idling)
+        completed_task.complete(0)
+
+        idling.idle_for(3)
+        idling.park()
+        idling.idle_until(completed_task)
+        with self.assertRaises(RuntimeError):
+            idling.idle_until(incomplete_task)
+
+    def test_nested_workflows_allocated(self):
+        allocate_workflow_to(self.actor, self.workflow)
+
+        self.assertIs(self.actor, self.workflow.idling.actor)
+        self.assertTrue(self.workflow.idling.logging)
+
+    def test_class_members_inspected_once(self):
+        first_workflow = PropertyWorkflow()
+        second_workflow = PropertyWorkflow()
+        allocate_workflow_to(self.actor, first_workflow)
+        evaluations = PropertyWorkflow.evaluations
+
+        allocate_workflow_to(self.actor, second_workflow)
+
+        self.assertEqual(('idling',), PropertyWorkflow._workflow_member_names)
+        self.assertEqual(evaluations + 1, PropertyWorkflow.evaluations)
+        self.assertIs(self.actor, second_workflow.idling.actor)
+
+    def test_reallocation_to_same_actor_skipped(self):
+        workflow = PropertyWorkflow()
+        allocate_workflow_to(self.actor, workflow)
+        evaluations = PropertyWorkflow.evaluations
+
+        allocate_workflow_to(self.actor, workflow)
+
+        self.assertEqual(evaluations, PropertyWorkflow.evaluations)
+
+    def test_reallocation_to_other_actor(self):
+        allocate_workflow_to(self.actor, self.workflow)
+        other_actor = TaskQueueActor('bob', self.clock)
+
+        allocate_workflow_to(other_actor, self.workflow)
+
+        self.assertIs(other_actor, self.workflow.idling.actor)
+
+    def test_synchronized_task_timing(self):
+        self.actor.allocate_task(self.workflow.task_a, self.workflow)
+        self.actor.allocate_task(self.workflow.task_c, self.workflow)
+        self.actor.initiate_shutdown()
+
+        self.actor.start()
+        self.clock.start()
+        self.clock.wait_for_last_tick()
+
+        self.assertEqual('task_a()[0->3]', str(self.actor.task_history[0]))
+        self.assertEqual('task_b()[1->3]', str(self.actor.task_history[0].sub_tasks[0]))
+        self.assertEqual('task_c()[3->6]', str(self.actor.task_history[1]))
+
+    def test_bound_entry_points(self):
+        clock = SynchronizingClock(max_ticks=10)
+        actor = InspectingActor('carol', clock)
+        actor.entry_points = list()
+        actor.allocate_task(self.workflow.task_a, self.workflow)
+        actor.initiate_shutdown()
+
+        actor.start()
+        clock.start()
+        clock.wait_for_last_tick()
+
+        self.assertEqual(['task_a', 'task_b'], [entry_point.__name__ for entry_point in actor.entry_points])
+        self.assertTrue(all(entry_point.__self__ is self.workflow for entry_point in actor.entry_points))
+        self.assertIs(self.workflow, actor.task_history[0].sub_tasks[0].entry_point.__self__)
+
+
+if __name__ == '__main__':
+    unittest.main()
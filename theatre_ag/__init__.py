@@ -1,9 +1,21 @@
-from .actor import Actor, TaskQueueActor
+from .actor import Actor, TaskQueue, TaskQueueActor
+from .async_actor import AsyncActor, AsyncTaskQueueActor
 from .cast import Cast
+from .checkpoint import CheckpointError, EpisodeCheckpoint
 from .clock import SynchronizingClock
+from .cost_model import CostModel
+from .discrete_event import DiscreteEventEpisode
 from .episode import Episode
 from .improv import Improv
+from .instrumentation import ClockInstrumentation, LatencyHistogram, TickTiming
 from .inter_clock_synchronization import InterClockSynchronization
+from .sharding import default_placement, ShardClock, ShardedEpisode, ShardError, ShardRouter, summarise_cast
 from .stopwatch_actor import StopwatchActor
-from .task import format_task_trees, Task
-from .workflow import Idling, default_cost
+from .sweep import Sweep, SweepResult
+from .task import format_task_trees, Task, TaskRecords, TaskRecordView, write_task_trees
+from .task_arrays import count_tasks_by, select_tasks, task_array, task_durations, total_duration_by, utilization
+from .task_event_log import BinaryTaskEventLog, JsonLinesTaskEventLog, TaskEventLog, read_binary_task_events
+from .thread_cache import ActorThreadCache
+from .tick_barrier import TickBarrier
+from .trace_policy import TracePolicy
+from .workflow import AsyncIdling, Idling, cost_function, default_cost, trace_with
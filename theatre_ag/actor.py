@@ -1,85 +1,226 @@
 import sys
 import traceback
 
-from queue import Queue, Empty
-from threading import Event, RLock, Thread
+from heapq import heappop, heappush
+from queue import Empty, Queue
+from threading import RLock, Thread
+from time import perf_counter
 
-from .task import Task
-from .workflow import allocate_workflow_to, Idling
+from .cost_model import CostModel
+from .task import Task, TaskRecords
+from .workflow import allocate_workflow_to, Idling, OutOfTurnsException, set_current_actor
 
 
-class OutOfTurnsException(Exception):
+class Actor(object):
     """
-    Raised when a theatre actor's task persists beyond the actor's clock's maximum tick.
+    Models the work behaviour of a self-directing entity.  Actors can be assigned tasks described by workflows which are
+    executed in synchronization with the actor's clock.  If <code>compact_task_history</code> is set (on the class or on
+    an actor before it starts) the actor's task history is kept as compact <code>TaskRecords</code> rather than as
+    <code>Task</code> objects, and is presented through <code>TaskRecordView</code>s.  The workflows and arguments of
+    tasks are not retained in compact task histories.  If a <code>task_event_log</code> is given, the initiation and
+    completion of tasks are also streamed to it, and the in-memory task history can then be disabled by clearing
+    <code>record_task_history</code>.  Task statistics (such as <code>task_count</code> and <code>last_tick</code>) are
+    maintained regardless.  The delays incurred by the actor's workflow methods are calculated by its
+    <code>cost_model</code>.  If a <code>trace_policy</code> is given, only the sub tasks it selects are recorded.
     """
 
-    def __init__(self, actor):
-        self.actor = actor
+    idling_class = Idling
 
-    def __str__(self):
-        return self.actor.logical_name, "out of turns after", self.actor.clock.current_tick, "ticks."
+    cost_model = CostModel()
 
+    compact_task_history = False
 
-class Actor(object):
-    """
-    Models the work behaviour of a self-directing entity.  Actors can be assigned tasks described by workflows which are
-    executed in synchronization with the actor's clock.
-    """
+    record_task_history = True
+
+    task_event_log = None
+
+    trace_policy = None
 
     def __init__(self, logical_name, clock):
         self.logical_name = logical_name
         self.clock = clock
 
-        self.tick_received = Event()
-        self.tick_received.clear()
-        self._waiting_for_tick = Event()
-        self._waiting_for_tick.clear()
-
-        self.busy = RLock()
         self.wait_for_directions = True
-        self.thread = Thread(target=self.perform)
-        self.thread.actor = self
 
-        self.clock.add_tick_listener(self)
+        self._initialise_runtime()
 
         self._task_history = list()
         self.current_task = None
 
-        self.idling = Idling()
+        self._task_records = None
+        self._current_record = TaskRecords.NONE
+        self._task_depth = 0
+        self._untraced_depth = 0
+
+        self._logging_current_task = False
+        self._logged_task_history = list()
+        self._last_task = None
+        self._task_count = 0
+        self._task_counts = dict()
+        self._last_tick = 0
+
+        self.idling = self.idling_class()
         allocate_workflow_to(self, self.idling, logging=False)
 
         self.next_turn = 0
 
+    def _initialise_runtime(self):
+        """
+        Creates the thread that will execute the actor's tasks and registers the actor with its clock.
+        """
+        self.busy = RLock()
+        self.thread = Thread(target=self.perform)
+        self.thread.actor = self
+
+        self.clock.add_tick_participant(self)
+
+    def __getstate__(self):
+        """
+        The actor's runtime (its thread and lock) is not part of its state.  Unpickled actors must be reinitialised with
+        <code>_initialise_runtime</code> once their clock is available, as is done when restoring a checkpoint.
+        """
+        state = self.__dict__.copy()
+        state.pop('busy', None)
+        state.pop('thread', None)
+        return state
+
+    @property
+    def quiescent(self):
+        """
+        True if the actor is not part way through performing a task, so that its performance could be restarted from
+        its state alone.  An actor is quiescent before it is started, while it is idling for lack of a task and once it
+        has shut down.
+        """
+        return not self.thread.is_alive() or self.current_task is None or self.current_task.workflow is self.idling
+
+    def _traces(self, entry_point, workflow):
+        """
+        :return: True if a call of the entry point by the current task should be recorded, according to the trace
+        policy of the entry point, of its workflow or of the actor, in that order of precedence.
+        """
+        policy = getattr(entry_point, 'trace_policy', None) or getattr(workflow, 'trace_policy', None) or \
+            self.trace_policy
+        return policy is None or policy.traces(entry_point, self._task_depth)
+
     def log_task_initiation(self, entry_point, workflow, args):
+        if self._untraced_depth > 0 or (self._task_depth > 0 and not self._traces(entry_point, workflow)):
+            # Calls made within an untraced call are not traced either.
+            self._untraced_depth += 1
+            return
+
+        current_tick = self.clock.current_tick
+        depth = self._task_depth
+        self._task_depth += 1
+
+        if self._task_records is None and self.record_task_history:
+            if self.current_task.initiated:
+                self.current_task = self.current_task.append_sub_task(entry_point, workflow, args)
+
+            self.current_task.initiate(current_tick)
+            task = self.current_task
 
-        if self.current_task.initiated:
-            self.current_task = self.current_task.append_sub_task(entry_point, workflow, args)
+        else:
+            task = None
+            if depth == 0:
+                self.current_task.initiate(current_tick)
+                task = self.current_task
 
-        self.current_task.initiate(self.clock.current_tick)
+            if self._task_records is not None and self._logging_current_task:
+                self._current_record = self._task_records.initiate(entry_point, current_tick, self._current_record)
+                task = self._task_records.view(self._current_record)
+
+        if self._logging_current_task:
+            self._count_task(task, entry_point, workflow, args, depth)
 
     def log_task_completion(self):
-        self.current_task.complete(self.clock.current_tick)
-        self.current_task = self.current_task.parent
+        if self._untraced_depth > 0:
+            self._untraced_depth -= 1
+            return
+
+        current_tick = self.clock.current_tick
+        self._task_depth -= 1
+
+        if self._task_records is None and self.record_task_history:
+            self.current_task.complete(current_tick)
+            self.current_task = self.current_task.parent
+
+        else:
+            if self._task_records is not None and self._logging_current_task:
+                self._current_record = self._task_records.complete(self._current_record, current_tick)
+
+            if self._task_depth == 0:
+                self.current_task.complete(current_tick)
+
+        if self._logging_current_task:
+            self._last_tick = current_tick
+            if self.task_event_log is not None:
+                self.task_event_log.task_completed(self, current_tick, self._task_depth)
+
+    def _count_task(self, task, entry_point, workflow, args, depth):
+        """
+        Updates the actor's task statistics (and task event log, if any) on the initiation of a task that belongs to
+        the actor's task history.
+        """
+        current_tick = self.clock.current_tick
+
+        if depth == 0:
+            self._last_task = task
+            if self.record_task_history:
+                self._logged_task_history.append(task)
+
+        self._task_count += 1
+        self._last_tick = current_tick
+
+        if len(self._task_counts) > 0:
+            if task is None:
+                task = Task(entry_point, workflow, args)
+                task.initiate(current_tick)
+
+            for task_filter in self._task_counts:
+                if task_filter(task):
+                    self._task_counts[task_filter] += 1
+
+        if self.task_event_log is not None:
+            self.task_event_log.task_initiated(self, entry_point, current_tick, depth)
 
     @property
     def task_history(self):
-        return list(filter(lambda task: task.workflow.logging is not False, self._task_history))
+        """
+        The top level tasks performed by the actor, excluding idling.  The returned list is maintained by the actor as
+        tasks are performed and should not be modified.
+        """
+        return self._logged_task_history
 
     @property
     def last_task(self):
-        try:
-            return self.task_history[-1]
-        except IndexError:
-            return None
+        return self._last_task
 
     @property
     def last_tick(self):
-        if self.last_task is None:
-            return 0
-        else:
-            return self.last_task.last_non_idling_tick
+        return self._last_tick
+
+    def register_task_filter(self, task_filter):
+        """
+        Registers a task filter, so that the number of tasks in the actor's history that satisfy it is maintained as
+        tasks are performed, and <code>task_count(task_filter)</code> can be answered without inspecting the actor's
+        history.  Filters are applied to each task as it is initiated, so should only depend on properties of a task
+        that are known at that time, such as its entry point, workflow, arguments and start tick.
+        """
+        if task_filter not in self._task_counts:
+            self._task_counts[task_filter] = self._recount_tasks(task_filter)
 
     def task_count(self, task_filter=None):
+        """
+        :return: the number of tasks (including sub tasks) in the actor's history that satisfy the task filter, or all
+        tasks if no filter is given.
+        """
+        if task_filter is None:
+            return self._task_count
+
+        count = self._task_counts.get(task_filter)
+        return self._recount_tasks(task_filter) if count is None else count
+
+    def _recount_tasks(self, task_filter):
 
         def recursive_task_count(task_history):
 
@@ -124,33 +265,66 @@ class Actor(object):
         executed synchronously until shutdown.  On shutdown, all remaining tasks in the queue are processed before
         termination.  Task execution will halt immediately if the actor's clock runs up to it's maximum tick count.
         """
+        set_current_actor(self)
+        instrumentation = self.clock.instrumentation
+        started = perf_counter() if instrumentation is not None else None
+
         while self.wait_for_directions or self.tasks_waiting():
             task = None
             try:
-                try:
-                    task = self.get_next_task()
-                    entry_point_name = task.entry_point.__name__
-                    allocate_workflow_to(self, task.workflow)
-                    task.entry_point = task.workflow.__class__.__getattribute__(task.workflow, entry_point_name)
-
-                except Empty:
-                    task = Task(self.idling.idle, self.idling)
-
-                if task is not None:
-                    self._task_history.append(task)
-                    self.current_task = task
-                    self.handle_task_return(task, task.entry_point(*task.args))
+                task = self._begin_next_task()
+                self.handle_task_return(task, task.entry_point(*task.args))
 
             except OutOfTurnsException:
                 break
             except Exception as e:
-                print("Warning, actor [%s] encountered exception [%s], in workflow [%s]." %
-                                     (self.logical_name, str(e), str(task), ), file=sys.stderr)
-                traceback.print_exc(file=sys.stderr)
+                self._report_task_exception(task, e)
+
+        if instrumentation is not None:
+            instrumentation.actor_performed(self, perf_counter() - started)
+
+        # Ensure that clock can proceed for other participants.
+        self.clock.remove_tick_participant(self)
+
+    def _begin_next_task(self):
+        """
+        Obtains the next task to be performed, or an idling task if none is available, and records it as the actor's
+        current task.
+        """
+        try:
+            task = self.get_next_task()
+            entry_point_name = task.entry_point.__name__
+            allocate_workflow_to(self, task.workflow)
+            task.entry_point = getattr(task.workflow, entry_point_name)
+
+        except Empty:
+            task = self._idle_task()
+
+        if not self.record_task_history:
+            pass
+        elif self.compact_task_history:
+            if self._task_records is None:
+                self._task_records = TaskRecords()
+            self._current_record = TaskRecords.NONE
+        else:
+            self._task_history.append(task)
+
+        self.current_task = task
+        self._task_depth = 0
+        self._untraced_depth = 0
+        self._logging_current_task = task.workflow.logging is not False
+        return task
 
-        # Ensure that clock can proceed for other listeners.
-        self.clock.remove_tick_listener(self)
-        self._waiting_for_tick.set()
+    def _idle_task(self):
+        """
+        :return: the task performed when no next task is available.  By default, the actor idles for one tick.
+        """
+        return Task(self.idling.idle, self.idling)
+
+    def _report_task_exception(self, task, e):
+        print("Warning, actor [%s] encountered exception [%s], in workflow [%s]." %
+              (self.logical_name, str(e), str(task), ), file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
 
     def start(self):
         if not self.thread.is_alive():
@@ -173,20 +347,16 @@ class Actor(object):
     def wait_for_shutdown(self):
         self.thread.join()
 
-    # noinspection PyMethodMayBeStatic,PyMethodMayBeStatic
     def calculate_delay(self, entry_point, workflow=None, args=()):
         """
-        Implementing classes or mix ins should override this method.  By default, this method will return the
-        <code>default_cost</code> cost annotation value of the entry point if it exists, or 0 if no
-        <code>default_cost</code> annotation is found.
-         :param entry_point: a function reference for the task about to be executed.
+        Implementing classes or mix ins may override this method.  By default, this method will return the delay given
+        by the actor's <code>cost_model</code>, which is the <code>cost_function</code> or <code>default_cost</code>
+        annotation value of the entry point if either exists, or 0 if neither annotation is found.
+         :param entry_point: the workflow method, bound to its workflow, for the task about to be executed.
          :param workflow: the socio-technical context that can be used to calculate the delay.
          :param args: the values to be invoked on the entry point into the workflow
         """
-        if hasattr(entry_point, 'default_cost'):
-            return entry_point.default_cost
-        else:
-            return 0
+        return self.cost_model.delay(entry_point, workflow, args)
 
     def incur_delay(self, attribute, workflow=None, args=()):
         delay = self.calculate_delay(attribute, workflow, args)
@@ -194,25 +364,45 @@ class Actor(object):
         self.next_turn = max(self.next_turn, self.clock.current_tick)
         self.next_turn += delay
 
+    def wait_for_ticks(self, duration):
+        """
+        Blocks the actor for the given number of ticks, incurred as a single delay.
+        """
+        self.next_turn = max(self.next_turn, self.clock.current_tick) + duration
+        self.wait_for_turn()
+
+    def wait_for_task(self, task):
+        """
+        Blocks the actor until the task has been completed, resuming on the tick after the task's completion.  The actor
+        does not need any ticks while it waits, so that a clock in next event mode can skip over them.
+        """
+        if task.completed:
+            return
+
+        self.next_turn = float('inf')
+        task.add_completion_callback(self._resume_after)
+        try:
+            self.wait_for_turn()
+        finally:
+            if self.next_turn == float('inf'):
+                self.next_turn = self.clock.current_tick
+
+    def _resume_after(self, task):
+        self.next_turn = task.finish_tick + 1
+        self.clock.reschedule(self)
+
     def wait_for_turn(self):
         """
         Blocks while the actor's clock time is less than the time of the actor's next turn.
         """
 
         while self.clock.current_tick < self.next_turn:
-            if self.clock.will_tick_again:
-                self._waiting_for_tick.set()
-                self.tick_received.wait()
-                self.tick_received.clear()
-            else:
+            if not self.clock.will_tick_again:
                 raise OutOfTurnsException(self)
-
-    def wait_for_tick(self):
-        self._waiting_for_tick.wait()
-
-    def notify_new_tick(self):
-        self._waiting_for_tick.clear()
-        self.tick_received.set()
+            elif self.clock.instrumentation is None:
+                self.clock.wait_for_next_tick(self)
+            else:
+                self.clock.instrumentation.wait_for_next_tick(self, lambda: self.clock.wait_for_next_tick(self))
 
     def __str__(self):
         return "a_%s" % self.logical_name
@@ -221,14 +411,72 @@ class Actor(object):
         return self.__str__()
 
 
+class TaskQueue(Queue):
+    """
+    A <code>queue.Queue</code> of tasks, from which tasks are taken in order of priority (lowest first), then of deadline
+    (earliest first, with tasks that have no deadline last) and then of insertion.  Items may be put in the queue as
+    (priority, deadline, task) tuples, or as tasks alone, which have priority 0 and no deadline.  If given, on_put is
+    invoked with the queue's mutex held whenever a task is put in the queue.
+    """
+
+    def __init__(self, on_put=None):
+        super(TaskQueue, self).__init__()
+        self.on_put = on_put
+
+    def __getstate__(self):
+        """
+        Only the queued tasks and the callback are part of the queue's state, as its locks cannot be pickled.
+        """
+        return {'queue': self.queue, 'sequence': self._sequence, 'on_put': self.on_put}
+
+    def __setstate__(self, state):
+        self.__init__(state['on_put'])
+        self.queue = state['queue']
+        self._sequence = state['sequence']
+
+    def put_all(self, items):
+        """
+        Puts a sequence of items in the queue, holding the queue's mutex once for the whole sequence.
+        """
+        with self.mutex:
+            for item in items:
+                self._put(item)
+                self.unfinished_tasks += 1
+            self.not_empty.notify(len(items))
+
+    def _init(self, maxsize):
+        self.queue = list()
+        self._sequence = 0
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, item):
+        priority, deadline, task = item if isinstance(item, tuple) else (0, None, item)
+        heappush(self.queue, (priority, float('inf') if deadline is None else deadline, self._sequence, task))
+        self._sequence += 1
+        if self.on_put is not None:
+            self.on_put()
+
+    def _get(self):
+        return heappop(self.queue)[-1]
+
+
 class TaskQueueActor(Actor):
     """
-    A simple actor class that receives executable tasks into a priority queue.
+    A simple actor class that receives executable tasks into a priority queue, its <code>TaskQueue</code>.  Tasks are
+    performed in order of priority (lowest first), then of deadline (earliest first, with tasks that have no deadline
+    last) and then of allocation.  While its queue is empty, the actor is parked: it needs no turns until a task is
+    put in its queue, it is instructed to shut down or its <code>wake_tick</code> is reached, so that a clock in next
+    event mode can skip the ticks that it is parked for.
     """
 
     def __init__(self, logical_name,  clock):
         super(TaskQueueActor, self).__init__(logical_name, clock)
-        self.task_queue = Queue()
+        self.task_queue = TaskQueue(on_put=self._wake)
+        # Allocation and parking are serialized with the queue's own mutex.
+        self._task_queue_lock = self.task_queue.mutex
+        self._parked = False
 
     def get_next_task(self):
         return self.task_queue.get(block=False)
@@ -236,9 +484,83 @@ class TaskQueueActor(Actor):
     def tasks_waiting(self):
         return not self.task_queue.empty()
 
-    def allocate_task(self, entry_point=None, workflow=None, args=None):
-        if args is None:
-            args = list()
-        allocated_task = Task(entry_point, workflow, args)
-        self.task_queue.put(allocated_task)
-        return allocated_task
+    def __getstate__(self):
+        state = super(TaskQueueActor, self).__getstate__()
+        state.pop('_task_queue_lock', None)
+        state['_parked'] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._task_queue_lock = self.task_queue.mutex
+
+    def allocate_task(self, entry_point=None, workflow=None, args=None, priority=0, deadline=None):
+        """
+        Allocates a task to the actor, waking the actor if it is parked.
+        :param priority: tasks with lower priority values are performed first.
+        :param deadline: the tick by which the task should be performed, used to order tasks of the same priority.
+        :return: the allocated <code>Task</code>.
+        """
+        return self.allocate_tasks([(entry_point, workflow, args)], priority, deadline)[0]
+
+    def allocate_tasks(self, tasks, priority=0, deadline=None):
+        """
+        Allocates a sequence of tasks to the actor, each given as an (entry point, workflow, arguments) tuple, with the
+        same priority and deadline.  The actor's queue is locked once for the whole sequence.
+        :return: a list of the allocated <code>Task</code>s, in the order given.
+        """
+        allocated_tasks = [Task(entry_point, workflow, list() if args is None else args)
+                           for entry_point, workflow, args in tasks]
+        self.task_queue.put_all([(priority, deadline, allocated_task) for allocated_task in allocated_tasks])
+        return allocated_tasks
+
+    def initiate_shutdown(self):
+        with self._task_queue_lock:
+            super(TaskQueueActor, self).initiate_shutdown()
+            self._wake()
+
+    def wake_tick(self):
+        """
+        Implementing classes may override this method to wake a parked actor at a tick provided by their clock, for
+        example to poll another source of tasks.  By default, a parked actor is only woken by the allocation of a task
+        or by shutdown, unless <code>get_next_task</code> is overridden, in which case the actor wakes on every tick to
+        poll for tasks, as it cannot be notified of tasks that do not arrive through its queue.
+        :return: the tick at which a parked actor should wake, even if no task has been allocated to it.
+        """
+        if type(self).get_next_task is not TaskQueueActor.get_next_task:
+            return self.clock.current_tick + 1
+        return float('inf')
+
+    def park(self):
+        """
+        Suspends the actor, without needing any ticks, until a task is allocated to it, it is instructed to shut down
+        or its wake tick is reached.  An actor woken by an allocation or by shutdown resumes on the following tick.
+        """
+        if self._begin_parking():
+            try:
+                self.wait_for_turn()
+            finally:
+                self._end_parking()
+
+    def _begin_parking(self):
+        with self._task_queue_lock:
+            if self.task_queue._qsize() > 0 or not self.wait_for_directions:
+                return False
+            self._parked = True
+            self.next_turn = max(self.wake_tick(), self.clock.current_tick + 1)
+            return True
+
+    def _end_parking(self):
+        with self._task_queue_lock:
+            self._parked = False
+            if self.next_turn == float('inf'):
+                self.next_turn = self.clock.current_tick
+
+    def _wake(self):
+        if self._parked:
+            self._parked = False
+            self.next_turn = self.clock.current_tick + 1
+            self.clock.reschedule(self)
+
+    def _idle_task(self):
+        return Task(self.idling.park, self.idling)
@@ -0,0 +1,143 @@
+import asyncio
+import inspect
+
+from threading import RLock
+from time import perf_counter
+
+from .actor import Actor, OutOfTurnsException, TaskQueueActor
+from .workflow import AsyncIdling, set_current_actor
+
+
+class AsyncActor(Actor):
+    """
+    An actor that performs its tasks as a task on an asyncio event loop, rather than in a dedicated thread, so that
+    very large numbers of actors can be simulated in a single process.  Workflow methods with a cost must be implemented
+    as coroutines (<code>async def</code>) and awaited by their callers, so that the actor can suspend while it waits
+    for its turn.  The actor's clock must be driven from the same event loop, for example by calling
+    <code>Episode.perform_async</code>.
+    """
+
+    idling_class = AsyncIdling
+
+    def _initialise_runtime(self):
+        """
+        Registers the actor with its clock as an asynchronous participant.  The actor's task is created when the actor
+        is started.
+        """
+        self.busy = RLock()
+        self.task = None
+
+        self.clock.add_async_tick_participant(self)
+
+    def __getstate__(self):
+        state = super(AsyncActor, self).__getstate__()
+        state.pop('task', None)
+        return state
+
+    @property
+    def quiescent(self):
+        return self.task is None or self.task.done() or self.current_task is None or \
+            self.current_task.workflow is self.idling
+
+    async def perform(self):
+        """
+        The asynchronous counterpart of <code>Actor.perform</code>.
+        """
+        set_current_actor(self)
+        instrumentation = self.clock.instrumentation
+        started = perf_counter() if instrumentation is not None else None
+
+        while self.wait_for_directions or self.tasks_waiting():
+            task = None
+            try:
+                task = self._begin_next_task()
+                value = task.entry_point(*task.args)
+                if inspect.isawaitable(value):
+                    value = await value
+                self.handle_task_return(task, value)
+
+            except OutOfTurnsException:
+                break
+            except Exception as e:
+                self._report_task_exception(task, e)
+
+        if instrumentation is not None:
+            instrumentation.actor_performed(self, perf_counter() - started)
+
+        # Ensure that clock can proceed for other participants.
+        self.clock.remove_async_tick_participant(self)
+
+    def start(self):
+        """
+        Schedules the actor's performance as a task on the running event loop.
+        """
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.perform())
+
+    async def shutdown(self):
+        self.initiate_shutdown()
+        await self.wait_for_shutdown()
+
+    async def wait_for_shutdown(self):
+        if self.task is not None:
+            await self.task
+
+    def wait_for_turn(self):
+        """
+        Synchronous workflow methods cannot suspend an asynchronous actor, so may only be invoked when no further ticks
+        need to be waited for.
+        :raises RuntimeError: if the actor must wait for its turn.
+        """
+        if self.clock.current_tick < self.next_turn:
+            raise RuntimeError(
+                "Asynchronous actor [%s] cannot wait for its turn in a synchronous workflow method." % self.logical_name)
+
+    async def wait_for_ticks_async(self, duration):
+        """
+        The asynchronous counterpart of <code>Actor.wait_for_ticks</code>.
+        """
+        self.next_turn = max(self.next_turn, self.clock.current_tick) + duration
+        await self.wait_for_turn_async()
+
+    async def wait_for_task_async(self, task):
+        """
+        The asynchronous counterpart of <code>Actor.wait_for_task</code>.
+        """
+        if task.completed:
+            return
+
+        self.next_turn = float('inf')
+        task.add_completion_callback(self._resume_after)
+        try:
+            await self.wait_for_turn_async()
+        finally:
+            if self.next_turn == float('inf'):
+                self.next_turn = self.clock.current_tick
+
+    async def wait_for_turn_async(self):
+        """
+        Suspends while the actor's clock time is less than the time of the actor's next turn.
+        """
+        while self.clock.current_tick < self.next_turn:
+            if not self.clock.will_tick_again:
+                raise OutOfTurnsException(self)
+            elif self.clock.instrumentation is None:
+                await self.clock.wait_for_next_tick_async()
+            else:
+                await self.clock.instrumentation.wait_for_next_tick_async(self, self.clock.wait_for_next_tick_async)
+
+
+class AsyncTaskQueueActor(AsyncActor, TaskQueueActor):
+    """
+    An asynchronous actor that receives executable tasks into a priority queue.
+    """
+
+    async def park_async(self):
+        """
+        The asynchronous counterpart of <code>TaskQueueActor.park</code>.
+        """
+        if self._begin_parking():
+            try:
+                await self.wait_for_turn_async()
+            finally:
+                self._end_parking()
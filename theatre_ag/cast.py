@@ -1,30 +1,106 @@
+import asyncio
+
+from threading import Lock
+
+
 class Cast(object):
     """
-    A set of actors.
+    A set of actors.  Members are indexed by their logical names, so that they can be looked up in constant time.  The
+    membership of a cast may be changed (through the methods of the cast) while it is performing, for example during
+    an improvisation.
     """
 
     def __init__(self, members=None):
-        self.members = set(members) if members is not None else set()
+        self._lock = Lock()
+        self.members = set()
+        self._members_by_name = dict()
+        self._member_names = None
+        if members is not None:
+            self.add_members(members)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
 
     def add_member(self, actor):
-        self.members.add(actor)
+        self.add_members((actor,))
+
+    def add_members(self, actors, start=False, thread_cache=None):
+        """
+        Adds the actors to the cast.
+        :param actors: an iterable of actors.
+        :param start: if True, the added actors are also started.
+        :param thread_cache: if given, the <code>ActorThreadCache</code> on which started actors are performed.
+        """
+        actors = list(actors)
+        with self._lock:
+            self.members.update(actors)
+            for actor in actors:
+                self._members_by_name[actor.logical_name] = actor
+            self._member_names = None
+        if start:
+            self.start_members(actors, thread_cache)
+
+    def remove_member(self, actor):
+        self.remove_members((actor,))
+
+    def remove_members(self, actors):
+        """
+        Removes the actors from the cast.  Removed actors are not shut down.
+        """
+        with self._lock:
+            for actor in actors:
+                self.members.discard(actor)
+                if self._members_by_name.get(actor.logical_name) is actor:
+                    del self._members_by_name[actor.logical_name]
+            self._member_names = None
 
     def get_member(self, name):
-        for member in self.members:
-            if member.logical_name == name:
-                return member
-        return None
+        return self._members_by_name.get(name)
 
     @property
     def member_names(self):
-        return {member.logical_name for member in self.members}
+        """
+        A snapshot of the logical names of the cast's members, which is rebuilt on demand after the membership changes,
+        so that it can be iterated while members are added by other threads.
+        """
+        member_names = self._member_names
+        if member_names is None:
+            with self._lock:
+                member_names = self._member_names
+                if member_names is None:
+                    member_names = self._member_names = frozenset(self._members_by_name)
+        return member_names
+
+    def snapshot(self):
+        """
+        :return: a list of the members of the cast at the time of the call.
+        """
+        with self._lock:
+            return list(self.members)
 
     def improvise(self, directions):
-        directions.apply(self.members)
+        directions.apply(self.snapshot())
+
+    def start(self, thread_cache=None):
+        """
+        Starts every member of the cast, each in its own thread or, if a thread cache is given, on a reusable worker of
+        the <code>ActorThreadCache</code>.
+        """
+        self.start_members(self.snapshot(), thread_cache)
 
-    def start(self):
-        for actor in self.members:
-            actor.start()
+    @staticmethod
+    def start_members(actors, thread_cache=None):
+        for actor in actors:
+            if thread_cache is None:
+                actor.start()
+            else:
+                thread_cache.start(actor)
 
     def shutdown(self):
         """
@@ -41,19 +117,40 @@ class Cast(object):
         """
         Notifies all actors in the cast to begin shutdown.
         """
-        for actor in self.members:
+        for actor in self.snapshot():
             actor.initiate_shutdown()
 
     def wait_for_shutdown(self):
         """
         Waits for all actors in the cast to complete shutdown.
         """
-        for actor in self.members:
+        for actor in self.snapshot():
             actor.wait_for_shutdown()
 
+    async def shutdown_async(self):
+        """
+        The asynchronous counterpart of <code>shutdown</code> for a cast of asynchronous actors.
+        """
+        self.initiate_shutdown()
+        await self.wait_for_shutdown_async()
+
+    async def wait_for_shutdown_async(self):
+        """
+        Waits for all asynchronous actors in the cast to complete shutdown.
+        """
+        await asyncio.gather(*(actor.wait_for_shutdown() for actor in self.snapshot()))
+
     @property
     def last_tick(self):
-        return max(map(lambda m: m.last_tick, self.members))
+        return max(map(lambda m: m.last_tick, self.snapshot()))
+
+    def register_task_filter(self, task_filter):
+        """
+        Registers the task filter with every member of the cast, so that <code>task_count(task_filter)</code> is
+        maintained incrementally.  See <code>Actor.register_task_filter</code>.
+        """
+        for actor in self.snapshot():
+            actor.register_task_filter(task_filter)
 
-    def task_count(self, task_filter):
-        return sum(map(lambda actor: actor.task_count(task_filter), self.members))
+    def task_count(self, task_filter=None):
+        return sum(map(lambda actor: actor.task_count(task_filter), self.snapshot()))
@@ -0,0 +1,110 @@
+import importlib
+import inspect
+import io
+import pickle
+import sys
+
+from types import FunctionType
+
+
+def _load_function(module_name, qualname):
+    """
+    :return: the original function found at the qualified name in the module, unwrapped from any synchronizing wrapper
+    applied to it since the module was imported.
+    """
+    owner = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        owner = getattr(owner, name)
+    return inspect.unwrap(owner)
+
+
+class _CheckpointPickler(pickle.Pickler):
+    """
+    Pickles the state of an episode.  The original task functions of tracked workflows, which are recorded as the entry
+    points of tasks and are hidden behind synchronizing wrappers on their classes, are pickled by module and qualified
+    name, so that they can be loaded whether or not the class has been treated as a workflow in the loading process.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, FunctionType):
+            owner = sys.modules.get(obj.__module__)
+            for name in obj.__qualname__.split('.'):
+                owner = getattr(owner, name, None)
+            if owner is not obj and getattr(owner, '__wrapped__', None) is obj:
+                return _load_function, (obj.__module__, obj.__qualname__)
+        return NotImplemented
+
+
+class CheckpointError(Exception):
+    """
+    Raised when an episode cannot be checkpointed.
+    """
+    pass
+
+
+class EpisodeCheckpoint(object):
+    """
+    A snapshot of an episode paused at a tick boundary: the state of its clock and of every actor in its cast, including
+    each actor's next turn, task queue, workflows and task history.  The snapshot is held in pickled form, so that any
+    number of independent continuations of the episode can be restored from it, and so that it can be saved to a file.
+    The clock, actors, workflows and tasks of the episode must be picklable.
+    """
+
+    def __init__(self, data, tick):
+        self.data = data
+        self.tick = tick
+
+    @staticmethod
+    def capture(episode):
+        """
+        Captures a checkpoint of an episode that has been paused with <code>Episode.perform_until</code>.
+        :raises CheckpointError: if any actor is part way through performing a task.
+        """
+        busy_actors = [actor for actor in episode.cast.snapshot() if not actor.quiescent]
+        if len(busy_actors) > 0:
+            raise CheckpointError(
+                "Episode cannot be checkpointed at tick [%d], as actors %s are performing tasks." %
+                (episode.clock.current_tick, sorted(str(actor) for actor in busy_actors)))
+
+        try:
+            stream = io.BytesIO()
+            _CheckpointPickler(stream).dump((episode.clock, episode.cast))
+            data = stream.getvalue()
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise CheckpointError("Episode cannot be checkpointed: [%s]." % str(e)) from e
+
+        return EpisodeCheckpoint(data, episode.clock.current_tick)
+
+    def restore(self, max_ticks=None):
+        """
+        Restores a new, independent episode from the checkpoint, ready to be continued with <code>perform</code> (or
+        <code>perform_until</code>).
+        :param max_ticks: if given, replaces the maximum tick of the restored episode's clock.
+        """
+        from .episode import Episode
+
+        clock, cast = pickle.loads(self.data)
+        if max_ticks is not None:
+            clock.max_ticks = max_ticks
+
+        for actor in cast.snapshot():
+            # Any idling in progress at the checkpoint is abandoned, so that the actor can start a task at once.
+            actor.current_task = None
+            actor._task_depth = 0
+            actor._untraced_depth = 0
+            actor.next_turn = min(actor.next_turn, clock.current_tick)
+            actor._initialise_runtime()
+
+        episode = Episode(clock, cast)
+        episode.improvised = True
+        return episode
+
+    def save(self, path):
+        with open(path, 'wb') as stream:
+            pickle.dump((self.tick, self.data), stream)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as stream:
+            tick, data = pickle.load(stream)
+        return EpisodeCheckpoint(data, tick)
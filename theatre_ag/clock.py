@@ -1,19 +1,71 @@
+import asyncio
+
+from itertools import chain
 from threading import Thread, Lock
 
+from .tick_barrier import AsyncTickBarrier, TickBarrier
+
+
+def exact_precision(granularity):
+    return granularity
+
 
 class SynchronizingClock(object):
+    """
+    Issues ticks to registered tick listeners and tick participants, waiting for all of them to be ready before each
+    tick.  Tick listeners are notified of each tick individually, while tick participants (typically actors) are
+    synchronized together through a single <code>TickBarrier</code>.  Asynchronous participants (such as
+    <code>AsyncActor</code>s) are synchronized through an <code>AsyncTickBarrier</code> instead, in which case the
+    clock must be driven from their event loop, by <code>tick_toc_async</code>.  By default, the
+    clock advances one tick at a time.  In next event mode, the clock instead advances directly to the earliest
+    pending turn (the <code>next_turn</code> attribute) of its listeners and participants, skipping ticks on which
+    nothing has any work to do.  Listeners that do not declare a <code>next_turn</code> are assumed to need every tick.
+    A clock in next event mode with no listeners or participants advances straight to its maximum tick.  Timing
+    measurements are taken if the clock is given a <code>ClockInstrumentation</code>.  A clock may drive parent clocks
+    with coarser time scales (see <code>add_parent_clock</code>).
+    """
 
-    def __init__(self, max_ticks=None):
+    def __init__(self, max_ticks=None, next_event=False, instrumentation=None):
         self.max_ticks = max_ticks
+        self.next_event = next_event
+        self.instrumentation = instrumentation
 
         self._ticks = 0
 
-        self._tick_listeners = list()
-        self._tick_listeners_lock = Lock()
+        # Listeners are kept in an insertion ordered dictionary, so that they can be added and removed in constant time,
+        # and presented to each tick as an immutable snapshot that is only rebuilt after the listeners change.
+        self._tick_listeners = dict()
+        self._tick_listeners_snapshot = ()
+        self._parent_clock_links = list()
 
         self.issue_ticks = True
 
+        self._initialise_runtime()
+
+    def _initialise_runtime(self):
+        """
+        Creates the barriers on which participants synchronize and the thread that will issue the clock's ticks.
+        """
+        self._tick_listeners_lock = Lock()
+
+        self._barrier = TickBarrier()
+        self._async_barrier = AsyncTickBarrier()
+
         self._thread = Thread(target=self.tick_toc)
+        self._async_task = None
+
+    def __getstate__(self):
+        """
+        The clock's runtime is not part of its state.  The participants of an unpickled clock must register again.
+        """
+        state = self.__dict__.copy()
+        for name in ('_tick_listeners_lock', '_barrier', '_async_barrier', '_thread', '_async_task'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._initialise_runtime()
 
     @property
     def current_tick(self):
@@ -31,49 +83,329 @@ class SynchronizingClock(object):
 
     def shutdown(self):
         self.issue_ticks = False
+        self._barrier.close()
         if self._thread.is_alive():
             self._thread.join()
 
     def wait_for_last_tick(self):
         self._thread.join()
 
+    def start_async(self):
+        """
+        Starts issuing ticks from a task on the running event loop, for clocks with asynchronous participants.
+        """
+        if self._async_task is None:
+            self._async_task = asyncio.get_running_loop().create_task(self.tick_toc_async())
+
+    async def wait_for_last_tick_async(self):
+        await self._async_task
+
     def add_tick_listener(self, listener):
-        self._tick_listeners_lock.acquire()
-        self._tick_listeners.append(listener)
-        self._tick_listeners_lock.release()
+        with self._tick_listeners_lock:
+            self._tick_listeners[listener] = None
+            self._tick_listeners_snapshot = None
 
     def remove_tick_listener(self, listener):
-        self._tick_listeners_lock.acquire()
-        self._tick_listeners.remove(listener)
-        self._tick_listeners_lock.release()
+        with self._tick_listeners_lock:
+            if listener not in self._tick_listeners:
+                raise ValueError("Tick listener [%s] is not registered with clock [%s]." % (listener, self))
+            del self._tick_listeners[listener]
+            self._tick_listeners_snapshot = None
+
+    def add_tick_participant(self, participant):
+        """
+        Registers a participant that must arrive at the clock's tick barrier (by calling <code>wait_for_next_tick</code>)
+        before each tick can be issued.
+        """
+        self._barrier.register(participant)
+
+    def remove_tick_participant(self, participant):
+        self._barrier.deregister(participant)
+
+    def wait_for_next_tick(self, participant=None):
+        """
+        Called by a tick participant to block until the clock issues its next tick.  If the participant is given, it
+        instead blocks until the clock reaches the participant's next turn, or will not tick again, without being woken
+        on the ticks in between.
+        """
+        self._barrier.arrive(participant)
+
+    def wait_for_participants(self):
+        """
+        Blocks until every tick participant is waiting for the clock's next tick.
+        """
+        self._barrier.wait_for_arrivals()
+
+    def add_async_tick_participant(self, participant):
+        """
+        Registers an asynchronous participant that must arrive at the clock's asynchronous tick barrier (by awaiting
+        <code>wait_for_next_tick_async</code>) before each tick can be issued.
+        """
+        self._async_barrier.register(participant)
+
+    def remove_async_tick_participant(self, participant):
+        self._async_barrier.deregister(participant)
+
+    async def wait_for_next_tick_async(self):
+        """
+        Called by an asynchronous tick participant to suspend until the clock issues its next tick.
+        """
+        await self._async_barrier.arrive()
+
+    def reschedule(self, participant):
+        """
+        Notifies the clock that the next turn of a participant waiting for ticks has been brought forward, for example
+        when a parked actor is allocated a task.
+        """
+        self._barrier.reschedule(participant)
+        self._async_barrier.reschedule(participant)
+
+    def replace_async_barrier(self, barrier):
+        """
+        Replaces the barrier at which the clock's asynchronous participants wait for ticks, for example with a scheduler
+        that performs the participants itself.
+        :return: the replaced barrier, so that it can be restored.
+        """
+        replaced, self._async_barrier = self._async_barrier, barrier
+        return replaced
 
     def get_cache_of_tick_listeners(self):
-        self._tick_listeners_lock.acquire()
-        cached_tick_listeners = list(self._tick_listeners)
-        self._tick_listeners_lock.release()
-        return cached_tick_listeners
+        """
+        :return: a tuple of the clock's tick listeners, which is shared between ticks until the listeners change.
+        """
+        snapshot = self._tick_listeners_snapshot
+        if snapshot is None:
+            with self._tick_listeners_lock:
+                snapshot = self._tick_listeners_snapshot
+                if snapshot is None:
+                    snapshot = self._tick_listeners_snapshot = tuple(self._tick_listeners)
+        return snapshot
 
     def tick(self):
         """
-        Issues a tick once all registered tick listeners are waiting for them.
+        Issues a tick once all registered tick listeners and participants are waiting for them.
         """
         if self.will_tick_again:
             self._tick()
 
     def _tick(self):
+        previous_tick = self._ticks
+        self._advance()
+        if len(self._parent_clock_links) > 0:
+            self._tick_parent_clocks(self._ticks - previous_tick)
+            if not self.will_tick_again:
+                self._stop_parent_clocks()
+
+    def _tick_parent_clocks(self, elapsed_ticks):
+        """
+        Advances each parent clock by the number of its ticks due after this clock advanced by the elapsed ticks, and
+        then the parents of each parent clock in turn.  A parent clock in next event mode may skip ticks, but does not
+        advance beyond the ticks due.
+        """
+        pending = [(self, elapsed_ticks)]
+        while len(pending) > 0:
+            child_clock, elapsed_ticks = pending.pop()
+            for clock, due_ticks in child_clock._due_parent_clocks(elapsed_ticks):
+                previous_tick = clock._ticks
+                last_tick = previous_tick + due_ticks
+                while clock._ticks < last_tick and clock.will_tick_again:
+                    clock._advance(last_tick)
+                if len(clock._parent_clock_links) > 0:
+                    pending.append((clock, clock._ticks - previous_tick))
+
+    def _advance(self, last_tick=None):
         cached_tick_listeners = self.get_cache_of_tick_listeners()
+        instrumentation = self.instrumentation
 
-        for tick_listener in cached_tick_listeners:
-            tick_listener.wait_for_tick()
+        if instrumentation is None:
+            for tick_listener in cached_tick_listeners:
+                tick_listener.wait_for_tick()
+        else:
+            slowest_listener = instrumentation.wait_for_listeners(cached_tick_listeners)
 
-        self._ticks += 1
+        self._barrier.wait_for_arrivals()
+
+        if instrumentation is not None:
+            instrumentation.tick_ready(self._ticks, *slowest_listener)
+
+        self._ticks = self._next_tick(cached_tick_listeners)
+        if last_tick is not None and self._ticks > last_tick:
+            self._ticks = last_tick
+
+        if instrumentation is not None:
+            instrumentation.tick_issued()
+
+        self._barrier.release(self._ticks if self.will_tick_again else None)
 
         for tick_listener in cached_tick_listeners:
             tick_listener.notify_new_tick()
 
+    def _next_tick(self, tick_listeners):
+        """
+        Calculates the tick that the clock will advance to from the current tick.  This is always the next tick unless
+        the clock is in next event mode, in which case the earliest pending turn of the listeners and participants is
+        used.
+        """
+        next_tick = self._ticks + 1
+
+        if not self.next_event:
+            return next_tick
+
+        next_turns = list()
+        for tick_listener in chain(tick_listeners, self._barrier.parties, self._async_barrier.parties):
+            next_turn = getattr(tick_listener, 'next_turn', None)
+            if next_turn is None:
+                return next_tick
+            next_turns.append(next_turn)
+
+        if len(next_turns) == 0 or min(next_turns) == float('inf'):
+            # Nothing has any pending work, so there are no further events to wait for.
+            return next_tick if self.max_ticks is None else max(self.max_ticks, next_tick)
+
+        next_event_tick = max(min(next_turns), next_tick)
+        if self.max_ticks is not None:
+            next_event_tick = min(next_event_tick, self.max_ticks)
+        return next_event_tick
+
+    def add_parent_clock(self, parent_clock, granularity=1, precision=exact_precision):
+        """
+        Makes this clock drive a parent clock with a coarser time scale, such that the parent ticks once every
+        granularity ticks of this clock.  Hierarchies of clocks (such as seconds, minutes and hours) are ticked from the
+        tick of the finest clock, without further threads or recursion.  Once this clock will not tick again, time also
+        ends on its parent clocks, so that their participants can shut down.
+        :param precision: a function of the granularity that gives the number of ticks of this clock in each successive
+        period of the parent clock, to model imprecise time keeping.
+        """
+        self._parent_clock_links.append(_ParentClockLink(parent_clock, granularity, precision))
+
+    def _stop_parent_clocks(self):
+        """
+        Ends time on the clocks above this one, once this clock will not tick again, by capping their maximum ticks at
+        their current ticks and releasing any participants waiting for their next ticks.
+        """
+        clocks = [link.parent_clock for link in self._parent_clock_links]
+        while len(clocks) > 0:
+            clock = clocks.pop()
+            if clock.max_ticks is None or clock.max_ticks > clock.current_tick:
+                clock.max_ticks = clock.current_tick
+            clock._barrier.release(None)
+            clock._async_barrier.release()
+            clocks.extend(link.parent_clock for link in clock._parent_clock_links)
+
+    def remove_parent_clock(self, parent_clock):
+        self._parent_clock_links = [link for link in self._parent_clock_links if link.parent_clock is not parent_clock]
+
+    def _due_parent_clocks(self, elapsed_ticks):
+        """
+        :return: a list of the parent clocks due ticks after this clock advances by the elapsed ticks, each paired with
+        the number of ticks due.
+        """
+        due_parent_clocks = list()
+        for link in self._parent_clock_links:
+            due_ticks = link.elapse(elapsed_ticks)
+            if due_ticks > 0 and link.parent_clock.will_tick_again:
+                due_parent_clocks.append((link.parent_clock, due_ticks))
+        return due_parent_clocks
+
     def tick_toc(self):
         while self.will_tick_again:
             self._tick()
 
+    async def tick_async(self):
+        """
+        Issues a tick once all registered tick listeners and asynchronous participants are waiting for them.
+        """
+        if self.will_tick_again:
+            await self._tick_async()
+
+    async def _tick_async(self):
+        previous_tick = self._ticks
+        await self._advance_async()
+        if len(self._parent_clock_links) > 0:
+            pending = [(self, self._ticks - previous_tick)]
+            while len(pending) > 0:
+                child_clock, elapsed_ticks = pending.pop()
+                for clock, due_ticks in child_clock._due_parent_clocks(elapsed_ticks):
+                    previous_tick = clock._ticks
+                    last_tick = previous_tick + due_ticks
+                    while clock._ticks < last_tick and clock.will_tick_again:
+                        await clock._advance_async(last_tick)
+                    if len(clock._parent_clock_links) > 0:
+                        pending.append((clock, clock._ticks - previous_tick))
+            if not self.will_tick_again:
+                self._stop_parent_clocks()
+
+    async def _advance_async(self, last_tick=None):
+        cached_tick_listeners = self.get_cache_of_tick_listeners()
+        instrumentation = self.instrumentation
+
+        if instrumentation is None:
+            for tick_listener in cached_tick_listeners:
+                tick_listener.wait_for_tick()
+        else:
+            slowest_listener = instrumentation.wait_for_listeners(cached_tick_listeners)
+
+        await self._async_barrier.wait_for_arrivals()
+        self._barrier.wait_for_arrivals()
+
+        if instrumentation is not None:
+            instrumentation.tick_ready(self._ticks, *slowest_listener)
+
+        self._ticks = self._next_tick(cached_tick_listeners)
+        if last_tick is not None and self._ticks > last_tick:
+            self._ticks = last_tick
+
+        if instrumentation is not None:
+            instrumentation.tick_issued()
+
+        self._barrier.release(self._ticks if self.will_tick_again else None)
+        self._async_barrier.release()
+
+        for tick_listener in cached_tick_listeners:
+            tick_listener.notify_new_tick()
+
+    async def tick_toc_async(self):
+        while self.will_tick_again:
+            await self._tick_async()
+        # Ensure asynchronous participants are not left waiting for a tick that will not be issued.
+        self._async_barrier.close()
+
     def __str__(self):
         return f"c({self.current_tick} of {self.max_ticks})"
+
+
+class _ParentClockLink(object):
+    """
+    Counts down the ticks of a child clock until its parent clock is next due a tick.
+    """
+
+    def __init__(self, parent_clock, granularity, precision):
+        self.parent_clock = parent_clock
+        self.granularity = granularity
+        self.precision = precision
+        self.count_down = self.next_time_period()
+
+    def next_time_period(self):
+        return max(self.precision(self.granularity), 1)
+
+    def elapse(self, elapsed_ticks):
+        """
+        Counts down the elapsed ticks of the child clock.
+        :return: the number of periods of the parent clock that have ended.
+        """
+        self.count_down -= elapsed_ticks
+        if self.count_down > 0:
+            return 0
+
+        if self.precision is exact_precision:
+            time_period = self.next_time_period()
+            periods, remainder = divmod(-self.count_down, time_period)
+            self.count_down = time_period - remainder
+            return periods + 1
+
+        # Imprecise periods may differ in length, so are counted one at a time.
+        periods = 0
+        while self.count_down <= 0:
+            self.count_down += self.next_time_period()
+            periods += 1
+        return periods
@@ -0,0 +1,117 @@
+import inspect
+
+from weakref import WeakKeyDictionary
+
+
+class _CostFunction(object):
+    """
+    Calculates the cost of a workflow method from the workflow and the arguments of each invocation, optionally
+    remembering the cost calculated for each distinct (workflow, arguments) pair.  Remembered costs are held weakly by
+    workflow, so that they do not outlive the workflows they were calculated for.
+    """
+
+    __slots__ = ('function', 'costs')
+
+    def __init__(self, function, memoize):
+        self.function = function
+        self.costs = WeakKeyDictionary() if memoize else None
+
+    def __call__(self, workflow, args):
+        if self.costs is None:
+            return self.function(workflow, *args)
+
+        try:
+            workflow_costs = self.costs.get(workflow)
+            cost = None if workflow_costs is None else workflow_costs.get(args)
+        except TypeError:
+            # Invocations on workflows that cannot be weakly referenced, or with unhashable arguments, are not memoized.
+            return self.function(workflow, *args)
+
+        if cost is None:
+            cost = self.function(workflow, *args)
+            if workflow_costs is None:
+                workflow_costs = self.costs[workflow] = dict()
+            workflow_costs[args] = cost
+        return cost
+
+
+class CostModel(object):
+    """
+    Calculates the delays incurred by workflow methods.  The cost of each method of a workflow class is resolved once,
+    when a method of the class is first invoked, and kept in a cost table for the class, so that calculating the delay of
+    an invocation is a dictionary lookup.  A method's cost is resolved from, in order of precedence:
+
+     * the model's costs, keyed by (workflow class, method name) or by method;
+     * the method's <code>cost_function</code> annotation;
+     * the method's <code>default_cost</code> annotation;
+     * the model's default cost.
+
+    A cost is either a number or a function of the workflow and the method's arguments.  The results of cost functions
+    are memoized for each distinct workflow and arguments, unless they are declared with <code>memoize=False</code>, so
+    cost functions should only depend on state of the workflow that is fixed while the model is in use.
+    :param costs: a dictionary of costs that override the annotations of workflow methods.
+    :param memoize: whether the results of cost functions given in the costs dictionary are memoized.
+    """
+
+    def __init__(self, costs=None, default=0, memoize=True):
+        self.costs = dict()
+        self.default = default
+        self.memoize = memoize
+
+        if costs is not None:
+            for key, cost in costs.items():
+                self.costs[getattr(key, '__wrapped__', key)] = cost
+
+        self._tables = dict()
+
+    def __getstate__(self):
+        """
+        Cost tables are rebuilt as they are needed, so are not part of a model's state.
+        """
+        state = self.__dict__.copy()
+        state['_tables'] = dict()
+        return state
+
+    def delay(self, entry_point, workflow=None, args=()):
+        """
+        :return: the delay incurred by invoking the entry point (a workflow method or the function underlying it) on the
+        workflow with the given arguments.
+        """
+        entry_point = getattr(entry_point, '__func__', entry_point)
+        table = self._tables.get(workflow.__class__)
+        if table is None:
+            table = self._build_table(workflow.__class__)
+
+        cost = table.get(entry_point)
+        if cost is None:
+            cost = table[entry_point] = self._resolve_cost(entry_point, workflow.__class__)
+
+        return cost(workflow, args) if callable(cost) else cost
+
+    def _build_table(self, workflow_class):
+        table = dict()
+        for ancestor in workflow_class.__mro__[:-1]:
+            for name, member in vars(ancestor).items():
+                function = getattr(member, '__wrapped__', member)
+                if inspect.isfunction(function) and function not in table:
+                    table[function] = self._resolve_cost(function, workflow_class, name)
+
+        self._tables[workflow_class] = table
+        return table
+
+    def _resolve_cost(self, function, workflow_class, name=None):
+        function = getattr(function, '__wrapped__', function)
+        cost = self.costs.get((workflow_class, function.__name__ if name is None else name))
+        if cost is None:
+            cost = self.costs.get(function)
+
+        if cost is not None:
+            memoize = self.memoize
+        else:
+            cost = getattr(function, 'cost_function', None)
+            memoize = getattr(function, 'memoize_cost', True)
+
+        if cost is None:
+            return getattr(function, 'default_cost', self.default)
+
+        return _CostFunction(cost, memoize) if callable(cost) else cost
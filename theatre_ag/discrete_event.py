@@ -0,0 +1,181 @@
+import contextvars
+import heapq
+import random
+
+from itertools import count
+
+from .async_actor import AsyncActor
+
+
+class _Turn(object):
+    """
+    Awaited by an actor performed in a <code>DiscreteEventEpisode</code> to suspend until its next turn.
+    """
+
+    def __await__(self):
+        yield self
+
+
+_TURN = _Turn()
+
+
+class _EventSchedule(object):
+    """
+    Stands in for the asynchronous tick barrier of a clock whose participants are performed by a
+    <code>DiscreteEventEpisode</code>.  Rather than waiting for every participant to arrive, the schedule keeps a heap of
+    the turns that participants are waiting for.  Participants waiting for an infinite turn (such as parked actors) are
+    not in the heap until they are rescheduled.  The schedule presents itself to the clock as a single party, whose next
+    turn is the earliest scheduled turn.
+    """
+
+    def __init__(self, parties, order):
+        self._parties = set(parties)
+        self._order = order
+        self._sequence = count()
+
+        self._heap = list()
+        self._scheduled = dict()
+
+    @property
+    def parties(self):
+        return self,
+
+    @property
+    def registered_parties(self):
+        return frozenset(self._parties)
+
+    @property
+    def next_turn(self):
+        heap = self._heap
+        while len(heap) > 0 and self._scheduled.get(heap[0][-1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if len(heap) > 0 else float('inf')
+
+    def register(self, party):
+        self._parties.add(party)
+
+    def deregister(self, party):
+        self._parties.discard(party)
+        self._scheduled.pop(party, None)
+
+    def schedule(self, party):
+        turn = party.next_turn
+        self._scheduled[party] = turn
+        if turn != float('inf'):
+            heapq.heappush(self._heap, (turn, self._order(party), next(self._sequence), party))
+
+    def reschedule(self, party):
+        scheduled_turn = self._scheduled.get(party)
+        if scheduled_turn is not None and party.next_turn < scheduled_turn:
+            self.schedule(party)
+
+    def due(self, tick):
+        """
+        Removes the parties whose turns are due by the given tick from the schedule.
+        :return: the due parties, in their order of performance.
+        """
+        heap = self._heap
+        due_parties = list()
+        while len(heap) > 0 and heap[0][0] <= tick:
+            turn, _, _, party = heapq.heappop(heap)
+            if self._scheduled.get(party) == turn:
+                del self._scheduled[party]
+                due_parties.append(party)
+        return due_parties
+
+    async def arrive(self):
+        await _TURN
+
+    async def wait_for_arrivals(self):
+        pass
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class DiscreteEventEpisode(object):
+    """
+    Performs an episode for a cast of asynchronous actors in the calling thread, without an event loop.  The coroutine
+    of each actor is resumed directly when its turn is due, from a heap of the actors' next turns, so an actor waiting
+    for a turn far in the future costs nothing on the intervening ticks.  Actors due on the same tick are performed one
+    at a time, in order of logical name or, if a seed is given, in a random order drawn from the seed.  Runs are
+    therefore reproducible, and produce the same task histories as <code>Episode.perform_async</code> for casts whose
+    actors do not depend on the order of performance within a tick.
+
+    The cast must consist of <code>AsyncActor</code>s, whose workflows may only await the methods of other workflows
+    and of the actors themselves.  The clock may have tick listeners and parent clocks, but no threaded participants.
+    If the clock has no maximum tick, the episode ends once every actor has shut down.
+    """
+
+    def __init__(self, clock, cast, directions=None, seed=None):
+        self.clock = clock
+        self.cast = cast
+        self.directions = directions
+        self.seed = seed
+
+        self._coroutines = dict()
+
+    def _order(self):
+        if self.seed is None:
+            return lambda actor: str(actor.logical_name)
+        else:
+            return lambda actor, random_order=random.Random(self.seed).random: random_order()
+
+    def perform(self):
+        if self.directions is not None:
+            self.cast.improvise(self.directions)
+
+        actors = sorted(self.cast.snapshot(), key=lambda actor: str(actor.logical_name))
+        for actor in actors:
+            if not isinstance(actor, AsyncActor):
+                raise TypeError("Actor [%s] cannot be performed in a discrete event episode, as it is not an "
+                                "asynchronous actor." % actor.logical_name)
+
+        clock = self.clock
+        schedule = _EventSchedule((), self._order())
+        barrier = clock.replace_async_barrier(schedule)
+        for party in barrier.parties:
+            schedule.register(party)
+
+        try:
+            for actor in actors:
+                context = contextvars.copy_context()
+                self._coroutines[actor] = (context.run(actor.perform), context)
+                schedule.schedule(actor)
+
+            self._perform_turns(schedule, schedule.due(clock.current_tick))
+
+            while clock.will_tick_again and (len(self._coroutines) > 0 or clock.max_ticks is not None):
+                clock.tick()
+                self._perform_turns(schedule, schedule.due(clock.current_tick))
+
+            # Actors still waiting for turns once the clock has stopped are resumed so that they can shut down.
+            self._perform_turns(schedule, sorted(self._coroutines, key=lambda actor: str(actor.logical_name)))
+        finally:
+            # The clock's own barrier is restored with the participants that remain, so that the clock can be used
+            # again by other episodes.
+            clock.replace_async_barrier(barrier)
+            for party in set(barrier.parties) - schedule.registered_parties:
+                barrier.deregister(party)
+            for party in schedule.registered_parties - set(barrier.parties):
+                barrier.register(party)
+
+    def _perform_turns(self, schedule, actors):
+        for actor in actors:
+            coroutine, context = self._coroutines[actor]
+            try:
+                awaited = context.run(coroutine.send, None)
+            except StopIteration:
+                del self._coroutines[actor]
+                continue
+
+            if awaited is not _TURN:
+                coroutine.close()
+                del self._coroutines[actor]
+                raise RuntimeError("Actor [%s] awaited [%r], but only turns can be awaited in a discrete event episode."
+                                   % (actor.logical_name, awaited))
+
+            schedule.schedule(actor)
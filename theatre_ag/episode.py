@@ -1,6 +1,11 @@
+from .checkpoint import EpisodeCheckpoint
+
+
 class Episode(object):
     """
-    An aggregation of the artifacts necessary (clock, cast and directions) to perform a simulation.
+    An aggregation of the artifacts necessary (clock, cast and directions) to perform a simulation.  An episode can be
+    paused at a tick with <code>perform_until</code>, checkpointed, and then continued, or restored from the checkpoint
+    any number of times.
     """
 
     def __init__(self, clock, cast, directions=None):
@@ -8,9 +13,46 @@ class Episode(object):
         self.cast = cast
         self.directions = directions
 
-    def perform(self):
-        if self.directions is not None:
+        self.improvised = False
+        self.started = False
+
+    def _start_cast(self):
+        if self.directions is not None and not self.improvised:
             self.cast.improvise(self.directions)
+            self.improvised = True
+        if not self.started:
+            self.cast.start()
+            self.started = True
+
+    def perform(self):
+        self._start_cast()
         self.clock.start()
-        self.cast.start()
         self.clock.wait_for_last_tick()
+
+    def perform_until(self, tick):
+        """
+        Performs the episode up to the given tick, issuing ticks from the calling thread, then pauses the episode once
+        every actor is waiting for the next tick.  A paused episode can be checkpointed, and continued by calling
+        <code>perform</code>.  An episode that will not be continued should be ended by shutting down its clock.
+        """
+        self._start_cast()
+        while self.clock.current_tick < tick and self.clock.will_tick_again:
+            self.clock.tick()
+        self.clock.wait_for_participants()
+
+    def checkpoint(self):
+        """
+        Captures a checkpoint of the episode, which must have been paused with <code>perform_until</code>.
+        :return: an <code>EpisodeCheckpoint</code>.
+        :raises CheckpointError: if any actor is part way through performing a task.
+        """
+        return EpisodeCheckpoint.capture(self)
+
+    async def perform_async(self):
+        """
+        Performs the episode on the running event loop, for a cast of asynchronous actors.
+        """
+        self._start_cast()
+        self.clock.start_async()
+        await self.clock.wait_for_last_tick_async()
+        await self.cast.wait_for_shutdown_async()
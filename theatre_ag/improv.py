@@ -1,15 +1,35 @@
 class Improv:
     """
     An aggregation of the artifacts necessary (clock, cast and directions) to perform a simulation with no definite end
-    time.
+    time.  If a thread cache is given, threaded actors are performed on the reusable workers of the
+    <code>ActorThreadCache</code>, which suits improvisations to which many short lived actors are added.
     """
 
-    def __init__(self, clock, cast):
+    def __init__(self, clock, cast, thread_cache=None):
         self.clock = clock
         self.cast = cast
+        self.thread_cache = thread_cache
         self.blocked = True
+        self.performing = False
 
     def perform(self, start_clock=True):
         if start_clock:
             self.clock.start()
+        self.performing = True
+        self.cast.start(self.thread_cache)
+
+    async def perform_async(self, start_clock=True):
+        """
+        Starts the improvisation on the running event loop, for a cast of asynchronous actors.  As with
+        <code>perform</code>, the improvisation continues in the background once started.
+        """
+        if start_clock:
+            self.clock.start_async()
+        self.performing = True
         self.cast.start()
+
+    def add_members(self, actors):
+        """
+        Adds the actors to the improvisation's cast, starting them if the improvisation is already being performed.
+        """
+        self.cast.add_members(actors, start=self.performing, thread_cache=self.thread_cache)
@@ -0,0 +1,200 @@
+import json
+
+from threading import Lock
+from time import perf_counter
+
+
+class LatencyHistogram(object):
+    """
+    A histogram of durations, in buckets whose upper bounds are successive powers of two microseconds.
+    """
+
+    def __init__(self):
+        self.counts = dict()
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        bucket = 1 << max(int(seconds * 1e6), 0).bit_length()
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percentile):
+        """
+        :return: the upper bound, in seconds, of the bucket containing the given percentile of the recorded durations.
+        """
+        threshold = self.count * percentile / 100.0
+        cumulative = 0
+        for bucket in sorted(self.counts):
+            cumulative += self.counts[bucket]
+            if cumulative >= threshold:
+                return bucket / 1e6
+        return 0.0
+
+    def as_dict(self):
+        return {
+            'count': self.count, 'mean_seconds': self.mean, 'max_seconds': self.maximum,
+            'buckets_microseconds': {str(bucket): self.counts[bucket] for bucket in sorted(self.counts)}
+        }
+
+
+class TickTiming(object):
+    """
+    The timing of a single tick: the wall time between the clock issuing the previous tick and every listener and
+    participant becoming ready for this one, the participant that was last to become ready, and the listener that took
+    longest to become ready.
+    """
+
+    __slots__ = ('tick', 'seconds', 'straggler', 'slowest_listener', 'slowest_listener_seconds')
+
+    def __init__(self, tick, seconds, straggler, slowest_listener, slowest_listener_seconds):
+        self.tick = tick
+        self.seconds = seconds
+        self.straggler = straggler
+        self.slowest_listener = slowest_listener
+        self.slowest_listener_seconds = slowest_listener_seconds
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in TickTiming.__slots__}
+
+
+class ClockInstrumentation(object):
+    """
+    Measures where the wall time of a simulation goes.  Instrumentation is enabled by passing an instance to the
+    constructor of a clock, or assigning it to the clock's <code>instrumentation</code> attribute before the clock and
+    its actors are started.  When a clock has no instrumentation (the default), nothing is measured.
+
+    For each tick, the instrumentation records the tick's latency in a histogram, the actor that was last to wait for
+    the tick (the straggler) and the slowest tick listener.  For each actor, the instrumentation records the time spent
+    blocked waiting for ticks and the time spent busy performing tasks.
+    :param record_ticks: if True, a <code>TickTiming</code> is also retained for every tick.
+    """
+
+    def __init__(self, record_ticks=False):
+        self.record_ticks = record_ticks
+
+        self.tick_latency = LatencyHistogram()
+        self.tick_timings = list()
+        self.straggler_counts = dict()
+        self.slowest_listener_counts = dict()
+        self.listener_seconds = dict()
+        self.blocked_seconds = dict()
+        self.performing_seconds = dict()
+
+        self._lock = Lock()
+        self._tick_issued = perf_counter()
+        self._last_arrival = None
+        self._last_arrival_time = 0.0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def wait_for_listeners(self, tick_listeners):
+        """
+        Waits for each of the tick listeners to be ready for the next tick, recording the time each takes.
+        :return: the slowest listener and the time it took.
+        """
+        slowest_listener, slowest_seconds = None, 0.0
+        for tick_listener in tick_listeners:
+            started = perf_counter()
+            tick_listener.wait_for_tick()
+            seconds = perf_counter() - started
+
+            key = str(tick_listener)
+            self.listener_seconds[key] = self.listener_seconds.get(key, 0.0) + seconds
+            if slowest_listener is None or seconds > slowest_seconds:
+                slowest_listener, slowest_seconds = key, seconds
+        return slowest_listener, slowest_seconds
+
+    def wait_for_next_tick(self, actor, wait):
+        """
+        Records the arrival of the actor for the next tick, then invokes wait to block until the tick is issued,
+        recording the time the actor was blocked.
+        """
+        arrived = perf_counter()
+        with self._lock:
+            if arrived >= self._last_arrival_time:
+                self._last_arrival, self._last_arrival_time = actor.logical_name, arrived
+        wait()
+        self._add(self.blocked_seconds, actor.logical_name, perf_counter() - arrived)
+
+    async def wait_for_next_tick_async(self, actor, wait):
+        """
+        The asynchronous counterpart of <code>wait_for_next_tick</code>, where wait is a coroutine function.
+        """
+        arrived = perf_counter()
+        if arrived >= self._last_arrival_time:
+            self._last_arrival, self._last_arrival_time = actor.logical_name, arrived
+        await wait()
+        self._add(self.blocked_seconds, actor.logical_name, perf_counter() - arrived)
+
+    def actor_performed(self, actor, seconds):
+        self._add(self.performing_seconds, actor.logical_name, seconds)
+
+    def _add(self, totals, key, seconds):
+        with self._lock:
+            totals[key] = totals.get(key, 0.0) + seconds
+
+    def tick_ready(self, tick, slowest_listener, slowest_listener_seconds):
+        """
+        Invoked by the clock once all listeners and participants are ready for the tick after the given tick.
+        """
+        with self._lock:
+            seconds = perf_counter() - self._tick_issued
+            straggler = self._last_arrival
+            self._last_arrival, self._last_arrival_time = None, 0.0
+
+        self.tick_latency.record(seconds)
+        if straggler is not None:
+            self.straggler_counts[straggler] = self.straggler_counts.get(straggler, 0) + 1
+        if slowest_listener is not None:
+            self.slowest_listener_counts[slowest_listener] = self.slowest_listener_counts.get(slowest_listener, 0) + 1
+        if self.record_ticks:
+            self.tick_timings.append(TickTiming(tick, seconds, straggler, slowest_listener, slowest_listener_seconds))
+
+    def tick_issued(self):
+        self._tick_issued = perf_counter()
+
+    @property
+    def busy_seconds(self):
+        """
+        :return: a dictionary of the time each actor spent performing tasks, other than waiting for ticks.
+        """
+        with self._lock:
+            return {name: seconds - self.blocked_seconds.get(name, 0.0)
+                    for name, seconds in self.performing_seconds.items()}
+
+    def as_dict(self):
+        """
+        :return: a JSON serializable summary of the measurements.
+        """
+        busy_seconds = self.busy_seconds
+        with self._lock:
+            actors = {str(name): {'blocked_seconds': self.blocked_seconds.get(name, 0.0),
+                                  'busy_seconds': busy_seconds.get(name)}
+                      for name in set(self.blocked_seconds) | set(self.performing_seconds)}
+
+        return {
+            'tick_latency': self.tick_latency.as_dict(),
+            'stragglers': {str(name): count for name, count in self.straggler_counts.items()},
+            'slowest_listeners': self.slowest_listener_counts,
+            'listener_seconds': self.listener_seconds,
+            'actors': actors,
+            'ticks': [timing.as_dict() for timing in self.tick_timings]
+        }
+
+    def write_json(self, stream):
+        json.dump(self.as_dict(), stream, indent=2)
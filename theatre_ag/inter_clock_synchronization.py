@@ -1,6 +1,9 @@
+from .clock import exact_precision
+
+
 class InterClockSynchronization:
 
-    def __init__(self, parent, granularity=1, precision=lambda granularity: granularity):
+    def __init__(self, parent, granularity=1, precision=exact_precision):
         self._parent = parent
         self._granularity = granularity
         self._precision = precision
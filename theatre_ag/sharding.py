@@ -0,0 +1,338 @@
+import io
+import multiprocessing
+import pickle
+import traceback
+import zlib
+
+from queue import Empty
+from threading import BrokenBarrierError, Lock
+
+from .actor import Actor
+from .clock import SynchronizingClock
+from .episode import Episode
+from .task import format_task_trees, Task
+
+
+def default_placement(logical_name, shards):
+    """
+    Places an actor on a shard by a stable hash of its logical name, so that every shard process agrees on the
+    placement regardless of the interpreter's string hash seed.
+    """
+    return zlib.crc32(str(logical_name).encode('utf-8')) % shards
+
+
+def summarise_cast(cast, traces=False):
+    """
+    Summarises the performance of a cast as a picklable dictionary of its last tick and task count, together with the
+    last tick and task count of each member actor.
+    :param traces: if True, the summary of each actor also includes its formatted task history, as 'trace'.
+    """
+    actors = cast.snapshot()
+
+    def summarise_actor(actor):
+        summary = {'last_tick': actor.last_tick, 'task_count': actor.task_count(None)}
+        if traces:
+            summary['trace'] = format_task_trees(actor.task_history)
+        return summary
+
+    return {
+        'last_tick': max((actor.last_tick for actor in actors), default=0),
+        'task_count': sum(actor.task_count(None) for actor in actors),
+        'actors': {actor.logical_name: summarise_actor(actor) for actor in actors}
+    }
+
+
+class _ActorPickler(pickle.Pickler):
+    """
+    Pickles workflows for transfer between shards, replacing references to actors (which own threads and clocks) with
+    None.  A transferred workflow is re-allocated to the receiving actor when the task is performed.
+    """
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Actor):
+            return 'actor'
+        return None
+
+
+class _ActorUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        return None
+
+
+class _ShardExchange(object):
+    """
+    The state shared between the processes of a sharded episode: a barrier on which the shards' clocks synchronize, a
+    double buffered array of the tick proposed by each shard, a double buffered matrix of the number of tasks each
+    shard has sent to each other shard, and an inbound queue of allocated tasks for each shard.
+    """
+
+    def __init__(self, shards, context):
+        self.shards = shards
+        self.barrier = context.Barrier(shards)
+        self.proposals = context.RawArray('q', 2 * shards)
+        self.sent = context.RawArray('q', 2 * shards * shards)
+        self.queues = [context.Queue() for _ in range(shards)]
+
+
+class ShardRouter(object):
+    """
+    Allocates tasks to actors by logical name on behalf of the actors of one shard of a sharded episode.  Tasks for
+    actors on the same shard are allocated directly.  Tasks for actors on other shards are pickled and sent through the
+    receiving shard's inbound queue, and are delivered at the next tick boundary, so that an allocation made during
+    tick t can be started by the receiving actor at tick t + 1, wherever the actor is placed.
+    """
+
+    def __init__(self, shard, exchange, placement=default_placement):
+        self.shard = shard
+        self.exchange = exchange
+        self.placement = placement
+        self.cast = None
+
+        self._lock = Lock()
+        self._sent = [0] * exchange.shards
+        self._received = [0] * exchange.shards
+        self._pending = [dict() for _ in range(exchange.shards)]
+
+    @property
+    def shards(self):
+        return self.exchange.shards
+
+    def shard_of(self, logical_name):
+        return self.placement(logical_name, self.shards)
+
+    def owns(self, logical_name):
+        """
+        :return: True if the named actor is placed on this router's shard.
+        """
+        return self.shard_of(logical_name) == self.shard
+
+    def allocate_task(self, logical_name, entry_point, workflow=None, args=None):
+        """
+        Allocates a task to the named actor, which must be a <code>TaskQueueActor</code> on some shard of the episode.
+        The workflow and arguments of tasks sent to other shards must be picklable, and are copied in transfer.
+        """
+        shard = self.shard_of(logical_name)
+        if shard == self.shard:
+            self.cast.get_member(logical_name).allocate_task(entry_point, workflow, args)
+            return
+
+        if workflow is None:
+            # The entry point is sent by name, so its workflow must be sent with it.
+            workflow = Task(entry_point).workflow
+
+        stream = io.BytesIO()
+        _ActorPickler(stream).dump((logical_name, entry_point.__name__, workflow, args))
+
+        with self._lock:
+            sequence = self._sent[shard]
+            self._sent[shard] += 1
+            self.exchange.queues[shard].put((self.shard, sequence, stream.getvalue()))
+
+    def publish(self, parity):
+        """
+        Publishes the number of tasks sent to each shard so far, before the shard's clock arrives at the exchange's
+        barrier.  Invoked by the shard's clock once all local actors are waiting for the next tick.
+        """
+        offset = parity * self.shards * self.shards + self.shard * self.shards
+        with self._lock:
+            self.exchange.sent[offset:offset + self.shards] = self._sent
+
+    def receive(self, parity):
+        """
+        Delivers every task sent to this shard before the other shards arrived at the exchange's barrier, in order of
+        sending shard and then order of sending.  Tasks sent during a later tick are held back until the next tick
+        boundary.
+        """
+        offset = parity * self.shards * self.shards
+        expected = [self.exchange.sent[offset + sender * self.shards + self.shard] for sender in range(self.shards)]
+
+        inbound = self.exchange.queues[self.shard]
+        while any(self._received[sender] + len(self._pending[sender]) < expected[sender]
+                  for sender in range(self.shards)):
+            sender, sequence, payload = inbound.get()
+            self._pending[sender][sequence] = payload
+
+        for sender in range(self.shards):
+            while self._received[sender] < expected[sender]:
+                payload = self._pending[sender].pop(self._received[sender])
+                self._received[sender] += 1
+                logical_name, entry_point_name, workflow, args = _ActorUnpickler(io.BytesIO(payload)).load()
+                self.cast.get_member(logical_name).allocate_task(getattr(workflow, entry_point_name), workflow, args)
+
+
+class ShardClock(SynchronizingClock):
+    """
+    A local proxy for the clock of a sharded episode.  The clock synchronizes the actors of its own shard as normal,
+    but once they are all waiting for the next tick, it also waits at a barrier shared with the clocks of the other
+    shards before advancing.  In next event mode, the shards agree on the earliest next event tick proposed by any of
+    them.  Shutting down any shard's clock breaks the barrier, ending the episode on every shard.  If the exchange
+    with the other shards fails (for example, because a task cannot be delivered), the barrier is also broken, the
+    clock stops ticking and the formatted exception is kept as the clock's <code>failure</code>.
+    """
+
+    def __init__(self, router, max_ticks=None, next_event=False):
+        super(ShardClock, self).__init__(max_ticks, next_event)
+        self.router = router
+        self.failure = None
+        self._exchanges = 0
+        self._exchanged_tasks = 0
+
+    def _next_tick(self, tick_listeners):
+        try:
+            return self._exchange_next_tick(tick_listeners)
+        except Exception:
+            self.failure = traceback.format_exc()
+            self.router.exchange.barrier.abort()
+            self.issue_ticks = False
+            return self._ticks
+
+    def _exchange_next_tick(self, tick_listeners):
+        exchange = self.router.exchange
+        parity = self._exchanges % 2
+        self._exchanges += 1
+
+        # The tick proposals and sent counts are double buffered, as no shard can pass the barrier twice before every
+        # shard has read the values written before the first.
+        exchange.proposals[parity * exchange.shards + self.router.shard] = \
+            super(ShardClock, self)._next_tick(tick_listeners)
+        self.router.publish(parity)
+
+        try:
+            exchange.barrier.wait()
+        except BrokenBarrierError:
+            self.issue_ticks = False
+            return self._ticks
+
+        self.router.receive(parity)
+
+        next_tick = min(exchange.proposals[parity * exchange.shards:(parity + 1) * exchange.shards])
+
+        # Actors parked before tasks were delivered to them did not propose a next tick, so the shards must agree to
+        # issue the next tick whenever any task has been exchanged.
+        sent = exchange.sent[parity * exchange.shards * exchange.shards:(parity + 1) * exchange.shards * exchange.shards]
+        exchanged_tasks = sum(sent)
+        if exchanged_tasks > self._exchanged_tasks:
+            self._exchanged_tasks = exchanged_tasks
+            next_tick = min(next_tick, self._ticks + 1)
+
+        return next_tick
+
+    def shutdown(self):
+        self.router.exchange.barrier.abort()
+        super(ShardClock, self).shutdown()
+
+
+def _perform_shard(shard, exchange, shard_factory, max_ticks, next_event, placement, summarise, results):
+    try:
+        router = ShardRouter(shard, exchange, placement)
+        clock = ShardClock(router, max_ticks, next_event)
+        cast, directions = shard_factory(shard, clock, router)
+        router.cast = cast
+
+        Episode(clock, cast, directions).perform()
+        cast.wait_for_shutdown()
+
+        if clock.failure is not None:
+            results.put((shard, None, clock.failure))
+        else:
+            results.put((shard, summarise(cast), None))
+
+    except BaseException:
+        exchange.barrier.abort()
+        results.put((shard, None, traceback.format_exc()))
+
+
+class ShardError(Exception):
+    """
+    Raised when a shard of a sharded episode fails.
+    """
+
+    def __init__(self, shard, details):
+        super(ShardError, self).__init__(shard, details)
+        self.shard = shard
+        self.details = details
+
+    def __str__(self):
+        return "Shard [%d] failed:\n%s" % (self.shard, self.details)
+
+
+class ShardedEpisode(object):
+    """
+    Performs an episode with its cast split across several worker processes, so that a simulation can use more than one
+    core.  Each process builds its shard of the cast, by calling the shard factory, and performs it against a local
+    <code>ShardClock</code>.  The clocks of all the shards synchronize on a shared memory barrier on every tick.  Tasks
+    can be allocated to actors on any shard through the <code>ShardRouter</code> passed to the shard factory.
+
+    The shard factory is invoked in each worker process as <code>shard_factory(shard, clock, router)</code> and must
+    return a (cast, directions) pair, where directions may be None.  Actors should be created only on the shard
+    reported by <code>router.owns(logical_name)</code>.  The factory, and the result of summarising each shard's cast,
+    must be picklable.
+    """
+
+    def __init__(self, shard_factory, shards, max_ticks, next_event=False, placement=default_placement,
+                 summarise=summarise_cast, context=None):
+        self.shard_factory = shard_factory
+        self.shards = shards
+        self.max_ticks = max_ticks
+        self.next_event = next_event
+        self.placement = placement
+        self.summarise = summarise
+        self.context = multiprocessing.get_context() if context is None else context
+
+    def perform(self):
+        """
+        Performs the episode and waits for every shard to finish.
+        :return: a list of the summaries of each shard's cast, indexed by shard.
+        :raises ShardError: if any shard fails.
+        """
+        exchange = _ShardExchange(self.shards, self.context)
+        results = self.context.Queue()
+
+        processes = [
+            self.context.Process(
+                target=_perform_shard,
+                args=(shard, exchange, self.shard_factory, self.max_ticks, self.next_event, self.placement,
+                      self.summarise, results))
+            for shard in range(self.shards)]
+
+        for process in processes:
+            process.start()
+
+        summaries = [None] * self.shards
+        failure = None
+        pending = set(range(self.shards))
+        while len(pending) > 0:
+            try:
+                shard, summary, details = results.get(timeout=0.1)
+            except Empty:
+                crashed = [shard for shard in pending if processes[shard].exitcode not in (None, 0)]
+                exited = [shard for shard in pending if processes[shard].exitcode == 0]
+                if len(crashed) == 0 and len(exited) == 0:
+                    continue
+                try:
+                    # A shard may have put its result and exited after the timed out wait, so the result is collected
+                    # before the shard is reported as failed.
+                    shard, summary, details = results.get_nowait()
+                except Empty:
+                    if failure is None:
+                        shard = (crashed + exited)[0]
+                        failure = ShardError(shard, "Exited with code [%d] without a result." %
+                                             processes[shard].exitcode)
+                    exchange.barrier.abort()
+                    break
+
+            pending.discard(shard)
+            summaries[shard] = summary
+            if details is not None and failure is None:
+                failure = ShardError(shard, details)
+
+        for process in processes:
+            process.join(timeout=None if failure is None else 1)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        if failure is not None:
+            raise failure
+        return summaries
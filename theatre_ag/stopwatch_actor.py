@@ -1,4 +1,5 @@
 from .actor import TaskQueueActor
+from .clock import exact_precision
 from .workflow import Idling
 
 
@@ -42,10 +43,12 @@ class _StopwatchWorkflow:
 
 class StopwatchActor(TaskQueueActor):
     """
-    An actor with the repeated task of tracking time on what clock to enable a tick on a parent clock.
+    An actor with the repeated task of tracking time on what clock to enable a tick on a parent clock.  Clock
+    hierarchies are more efficiently composed with <code>SynchronizingClock.add_parent_clock</code>, which does not
+    require a thread for each level of the hierarchy.
     """
 
-    def __init__(self, logical_name,  clock, parent_clock, granularity, precision=lambda granularity: granularity):
+    def __init__(self, logical_name,  clock, parent_clock, granularity, precision=exact_precision):
         super(StopwatchActor, self).__init__(f'stopwatch for {logical_name}', clock)
         stopwatch_worfklow = _StopwatchWorkflow(clock, parent_clock, granularity, precision)
         self.allocate_task(stopwatch_worfklow.issue_tick, stopwatch_worfklow)
\ No newline at end of file
@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+import time
+import traceback
+
+from multiprocessing.connection import wait
+
+from .episode import Episode
+from .sharding import summarise_cast
+
+
+class SweepResult(object):
+    """
+    The outcome of one run of a sweep: either the summary of the run's cast, the details of the exception that ended
+    the run, or an indication that the run exceeded the sweep's timeout.
+    """
+
+    def __init__(self, index, configuration, summary=None, error=None, timed_out=False, elapsed=0.0):
+        self.index = index
+        self.configuration = configuration
+        self.summary = summary
+        self.error = error
+        self.timed_out = timed_out
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self):
+        return self.error is None and not self.timed_out
+
+    def __str__(self):
+        if self.timed_out:
+            outcome = 'timed out'
+        elif self.error is not None:
+            outcome = 'failed'
+        else:
+            outcome = 'last tick %d' % self.summary['last_tick']
+        return "run %d (%s): %s in %.2fs" % (self.index, self.configuration, outcome, self.elapsed)
+
+
+def _perform_run(episode_factory, configuration, summarise, connection):
+    try:
+        clock, cast, directions = episode_factory(configuration)
+        Episode(clock, cast, directions).perform()
+        cast.wait_for_shutdown()
+        connection.send((summarise(cast), None))
+    except BaseException:
+        connection.send((None, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class Sweep(object):
+    """
+    Performs an episode for each of a sequence of configurations, for example in a parameter study.  Each run is
+    performed in its own worker process, with up to <code>processes</code> runs performed at once.  A run that exceeds
+    the timeout is terminated without affecting the other runs.
+
+    The episode factory is invoked in the worker process as <code>episode_factory(configuration)</code> and must return
+    a (clock, cast, directions) triple, where directions may be None.  The clock must have a maximum tick, or the run
+    must otherwise end, within the timeout.  The factory, the configurations and the summary of each run's cast must be
+    picklable.  To include the task histories of actors in the summaries, summarise with
+    <code>functools.partial(summarise_cast, traces=True)</code>.
+    """
+
+    def __init__(self, episode_factory, configurations, processes=None, timeout=None, summarise=summarise_cast,
+                 context=None):
+        self.episode_factory = episode_factory
+        self.configurations = configurations
+        self.processes = os.cpu_count() if processes is None else processes
+        self.timeout = timeout
+        self.summarise = summarise
+        self.context = multiprocessing.get_context() if context is None else context
+
+    def results(self):
+        """
+        Performs the sweep.
+        :return: a generator of <code>SweepResult</code>s, in the order that the runs finish.
+        """
+        configurations = enumerate(self.configurations)
+        running = dict()
+        try:
+            while True:
+                while len(running) < self.processes:
+                    index_configuration = next(configurations, None)
+                    if index_configuration is None:
+                        break
+                    index, configuration = index_configuration
+                    reader, writer = self.context.Pipe(duplex=False)
+                    process = self.context.Process(
+                        target=_perform_run, args=(self.episode_factory, configuration, self.summarise, writer))
+                    process.start()
+                    writer.close()
+                    running[reader] = (index, configuration, process, time.monotonic())
+
+                if len(running) == 0:
+                    return
+
+                timeout = None
+                if self.timeout is not None:
+                    earliest_start = min(started for _, _, _, started in running.values())
+                    timeout = max(0.0, earliest_start + self.timeout - time.monotonic())
+
+                for reader in wait(list(running), timeout):
+                    index, configuration, process, started = running.pop(reader)
+                    try:
+                        summary, error = reader.recv()
+                    except EOFError:
+                        summary, error = None, None
+                    reader.close()
+
+                    self._stop(process, 1.0)
+                    if summary is None and error is None:
+                        error = "Run exited with code [%s]." % process.exitcode
+
+                    yield SweepResult(index, configuration, summary, error, elapsed=time.monotonic() - started)
+
+                if self.timeout is not None:
+                    now = time.monotonic()
+                    for reader, (index, configuration, process, started) in list(running.items()):
+                        if now - started >= self.timeout:
+                            del running[reader]
+                            reader.close()
+                            self._stop(process, 0)
+                            yield SweepResult(index, configuration, timed_out=True, elapsed=now - started)
+        finally:
+            # Runs still in progress when the generator is closed early are abandoned.
+            for reader, (_, _, process, _) in running.items():
+                reader.close()
+                self._stop(process, 0)
+
+    @staticmethod
+    def _stop(process, timeout):
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    def perform(self):
+        """
+        Performs the sweep and waits for every run to finish.
+        :return: a list of <code>SweepResult</code>s, in the order of the configurations.
+        """
+        return sorted(self.results(), key=lambda result: result.index)
@@ -1,6 +1,10 @@
 import inspect
 
-from .workflow import Idling
+from array import array
+from io import StringIO
+from threading import Lock
+
+from .workflow import AsyncIdling, Idling
 
 
 class Task(object):
@@ -8,6 +12,11 @@ class Task(object):
     Captures status information about a task to be performed by an actor.
     """
 
+    __slots__ = (
+        'entry_point', 'workflow', 'parent', 'args', 'start_tick', 'finish_tick', 'sub_tasks', 'completion_callbacks')
+
+    _completion_callbacks_lock = Lock()
+
     def __init__(self, entry_point, workflow=None, args=(), parent=None):
 
         self.entry_point = entry_point
@@ -39,6 +48,8 @@ class Task(object):
 
         self.sub_tasks = list()
 
+        self.completion_callbacks = None
+
     def initiate(self, start_tick):
         self.start_tick = start_tick
 
@@ -48,7 +59,29 @@ class Task(object):
         return sub_task
 
     def complete(self, finish_tick):
-        self.finish_tick = finish_tick
+        # The task is completed under the same lock as callbacks are registered, so that a callback registered
+        # concurrently is either invoked here or invoked immediately on registration.
+        with Task._completion_callbacks_lock:
+            self.finish_tick = finish_tick
+            completion_callbacks = self.completion_callbacks
+            self.completion_callbacks = None
+
+        if completion_callbacks is not None:
+            for completion_callback in completion_callbacks:
+                completion_callback(self)
+
+    def add_completion_callback(self, completion_callback):
+        """
+        Registers a function to be invoked with the task when the task is completed, or immediately if the task has
+        already been completed.  The function is invoked by the thread of the actor that completes the task.
+        """
+        with Task._completion_callbacks_lock:
+            if not self.completed:
+                if self.completion_callbacks is None:
+                    self.completion_callbacks = list()
+                self.completion_callbacks.append(completion_callback)
+                return
+        completion_callback(self)
 
     @property
     def siblings(self):
@@ -56,7 +89,7 @@ class Task(object):
 
     @property
     def is_last_sibling(self):
-        return self.parent is not None and self.siblings.index(self) == len(self.siblings) - 1
+        return self.parent is not None and self.siblings[-1] is self
 
     @property
     def has_siblings(self):
@@ -106,22 +139,229 @@ class Task(object):
         return '%s(%s)[%s->%s]' % (self.entry_point_name, args, start_tick, finish_tick)
 
 
+class TaskRecords(object):
+    """
+    A compact, columnar store of the history of the tasks performed by an actor.  Each task is recorded as one row of
+    integer columns (entry point id, start tick, finish tick, parent index and depth) in task initiation order, so that
+    the records of the sub tasks of a task immediately follow it.  Entry points are interned, and the workflows and
+    arguments of recorded tasks are not retained.  <code>TaskRecordView</code>s present individual records through the
+    same interface as <code>Task</code>.
+    """
+
+    NONE = -1
+
+    def __init__(self):
+        self.entry_point_ids = array('q')
+        self.start_ticks = array('q')
+        self.finish_ticks = array('q')
+        self.parents = array('q')
+        self.depths = array('q')
+
+        self.roots = array('q')
+
+        self.entry_points = list()
+        self._entry_point_ids = dict()
+
+    def __len__(self):
+        return len(self.start_ticks)
+
+    def initiate(self, entry_point, start_tick, parent=NONE):
+        """
+        Records the initiation of a task.  Entry points are recorded as their underlying functions, so that the records
+        do not retain workflows.
+        :return: the index of the new task record.
+        """
+        entry_point = getattr(entry_point, '__func__', entry_point)
+        entry_point_id = self._entry_point_ids.get(entry_point)
+        if entry_point_id is None:
+            entry_point_id = len(self.entry_points)
+            self._entry_point_ids[entry_point] = entry_point_id
+            self.entry_points.append(entry_point)
+
+        index = len(self.start_ticks)
+
+        self.entry_point_ids.append(entry_point_id)
+        self.start_ticks.append(start_tick)
+        self.finish_ticks.append(TaskRecords.NONE)
+        self.parents.append(parent)
+
+        if parent == TaskRecords.NONE:
+            self.depths.append(0)
+            self.roots.append(index)
+        else:
+            self.depths.append(self.depths[parent] + 1)
+
+        return index
+
+    def complete(self, index, finish_tick):
+        """
+        Records the completion of a task.
+        :return: the index of the completed task's parent record.
+        """
+        self.finish_ticks[index] = finish_tick
+        return self.parents[index]
+
+    def subtree_end(self, index):
+        """
+        :return: the index following the last record in the subtree of the specified task record.
+        """
+        depth = self.depths[index]
+        end = index + 1
+        while end < len(self.depths) and self.depths[end] > depth:
+            end += 1
+        return end
+
+    def children(self, index):
+        depth = self.depths[index] + 1
+        return [child for child in range(index + 1, self.subtree_end(index)) if self.depths[child] == depth]
+
+    def view(self, index):
+        return TaskRecordView(self, index)
+
+    @property
+    def root_views(self):
+        return [TaskRecordView(self, index) for index in self.roots]
+
+
+class TaskRecordView(object):
+    """
+    Presents a single task record held in <code>TaskRecords</code> with the same interface as <code>Task</code>.  The
+    workflow and arguments of a recorded task are not retained, so are given as None and an empty tuple respectively.
+    """
+
+    __slots__ = ('records', 'index')
+
+    workflow = None
+    args = ()
+
+    def __init__(self, records, index):
+        self.records = records
+        self.index = index
+
+    @property
+    def entry_point(self):
+        return self.records.entry_points[self.records.entry_point_ids[self.index]]
+
+    @property
+    def start_tick(self):
+        return self.records.start_ticks[self.index]
+
+    @property
+    def finish_tick(self):
+        finish_tick = self.records.finish_ticks[self.index]
+        return None if finish_tick == TaskRecords.NONE else finish_tick
+
+    @property
+    def depth(self):
+        return self.records.depths[self.index]
+
+    @property
+    def parent(self):
+        parent = self.records.parents[self.index]
+        return None if parent == TaskRecords.NONE else TaskRecordView(self.records, parent)
+
+    @property
+    def sub_tasks(self):
+        return [TaskRecordView(self.records, child) for child in self.records.children(self.index)]
+
+    @property
+    def siblings(self):
+        parent = self.parent
+        return None if parent is None else parent.sub_tasks
+
+    @property
+    def is_last_sibling(self):
+        if self.records.parents[self.index] == TaskRecords.NONE:
+            return False
+        end = self.records.subtree_end(self.index)
+        return end == len(self.records) or self.records.parents[end] != self.records.parents[self.index]
+
+    @property
+    def has_siblings(self):
+        return self.records.parents[self.index] != TaskRecords.NONE
+
+    entry_point_func = Task.entry_point_func
+    initiated = Task.initiated
+    completed = Task.completed
+    non_idling_sub_tasks = Task.non_idling_sub_tasks
+    last_non_idling_sub_task = Task.last_non_idling_sub_task
+    last_non_idling_tick = Task.last_non_idling_tick
+    entry_point_name = Task.entry_point_name
+    __repr__ = Task.__repr__
+
+    def __eq__(self, other):
+        return isinstance(other, TaskRecordView) and self.records is other.records and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.records), self.index))
+
+
+def write_task_trees(tasks, stream, indent="", max_depth=None, elide_idling=False):
+    """
+    Writes a textual rendering of the trees of the specified tasks to a file-like stream, in a single pass over the
+    tasks.
+    :param tasks: the tasks at the roots of the trees to write.
+    :param stream: the file-like object to write to.
+    :param indent: a prefix for every line written.
+    :param max_depth: if given, sub tasks nested more deeply than this below the specified tasks are not written.
+    :param elide_idling: if True, each run of consecutive sibling idle tasks is summarised on a single line.
+    """
+    frames = [[list(tasks), 0, indent, 0]]
+
+    while len(frames) > 0:
+        frame = frames[-1]
+        siblings, index, indent, depth = frame
+
+        if index >= len(siblings):
+            frames.pop()
+            continue
+
+        task = siblings[index]
+        sub_tasks = task.sub_tasks
+        has_parent = task.parent is not None
+
+        arrow_mid = "+" if len(sub_tasks) > 0 else "-"
+        arrow_tail = "+" if has_parent else "-"
+
+        if elide_idling and len(sub_tasks) == 0 and is_idling_task(task):
+            run_end = index
+            while run_end + 1 < len(siblings) and len(siblings[run_end + 1].sub_tasks) == 0 \
+                    and is_idling_task(siblings[run_end + 1]):
+                run_end += 1
+
+            if run_end > index:
+                finish_tick = siblings[run_end].finish_tick
+                stream.write('%s%s-%s-> %s()[%s->%s] x%d\n' % (
+                    indent, arrow_tail, arrow_mid, task.entry_point_name, task.start_tick,
+                    '?' if finish_tick is None else finish_tick, run_end - index + 1))
+                frame[1] = run_end + 1
+                continue
+
+        stream.write(indent + arrow_tail + "-" + arrow_mid + "-> " + str(task) + "\n")
+        frame[1] = index + 1
+
+        if max_depth is None or depth < max_depth:
+            # Below the top level, the siblings being written are the sub tasks of the same parent.
+            has_later_siblings = not task.is_last_sibling if depth == 0 else index < len(siblings) - 1
+            child_indent = indent + ("| " if has_parent and has_later_siblings else "  ")
+            frames.append([sub_tasks, 0, child_indent, depth + 1])
+
+
 def format_task_trees(tasks, indent=""):
-    result = ""
-    for task in tasks:
-        result += format_task_tree(task, indent)
-    return result
+    result = StringIO()
+    write_task_trees(tasks, result, indent)
+    return result.getvalue()
 
 
 def format_task_tree(task, indent=""):
+    return format_task_trees([task], indent)
 
-    arrow_mid = "+" if len(task.sub_tasks) > 0 else "-"
-    arrow_tail = "-" if task.parent is None else "+" if task.is_last_sibling else "+"
 
-    result = indent + arrow_tail + "-" + arrow_mid + "-> " + str(task) + "\n"
-
-    indent += "| " if task.has_siblings and not task.is_last_sibling else "  "
+def is_idling_task(task):
+    """
+    :return: True if the task is an invocation of an idling workflow's <code>idle</code> method.
+    """
+    return inspect.unwrap(task.entry_point_func) in _IDLE_ENTRY_POINTS
 
-    result += format_task_trees(task.sub_tasks, indent)
 
-    return result
+_IDLE_ENTRY_POINTS = (inspect.unwrap(vars(Idling)['idle']), inspect.unwrap(vars(AsyncIdling)['idle']))
@@ -0,0 +1,150 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .cast import Cast
+from .task import TaskRecords
+
+
+NONE = TaskRecords.NONE
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for the columnar export of task histories.")
+
+
+def _actors(actors):
+    if isinstance(actors, Cast):
+        actors = actors.snapshot()
+    elif hasattr(actors, 'task_history'):
+        actors = [actors]
+    return sorted(actors, key=lambda actor: str(actor.logical_name))
+
+
+def _actor_columns(actor):
+    """
+    :return: the entry point names, start ticks, finish ticks, depths and parent indices of the tasks in the actor's
+    history, in task initiation order.
+    """
+    records = actor._task_records
+    if records is not None:
+        names = numpy.array([entry_point.__name__ for entry_point in records.entry_points], dtype=str)
+        return (names[numpy.array(records.entry_point_ids, dtype=numpy.int64)],
+                numpy.array(records.start_ticks, dtype=numpy.int64),
+                numpy.array(records.finish_ticks, dtype=numpy.int64),
+                numpy.array(records.depths, dtype=numpy.int64),
+                numpy.array(records.parents, dtype=numpy.int64))
+
+    entry_point_names, start_ticks, finish_ticks, depths, parents = list(), list(), list(), list(), list()
+
+    stack = [(task, 0, NONE) for task in reversed(actor.task_history)]
+    while len(stack) > 0:
+        task, depth, parent = stack.pop()
+        index = len(start_ticks)
+
+        entry_point_names.append(task.entry_point_name)
+        start_ticks.append(NONE if task.start_tick is None else task.start_tick)
+        finish_ticks.append(NONE if task.finish_tick is None else task.finish_tick)
+        depths.append(depth)
+        parents.append(parent)
+
+        stack.extend((sub_task, depth + 1, index) for sub_task in reversed(task.sub_tasks))
+
+    return entry_point_names, start_ticks, finish_ticks, depths, parents
+
+
+def task_array(actors):
+    """
+    Flattens the task histories of an actor, a cast or an iterable of actors into a NumPy structured array, with one
+    row for each task in order of actor name and then of task initiation, so that the rows of the sub tasks of a task
+    follow it.  The fields of each row are the actor's logical name (as a string), the task's entry point name, start
+    tick, finish tick (<code>NONE</code> if incomplete), depth below the actor's top level tasks, and the row index of
+    its parent task (<code>NONE</code> for top level tasks).  Compact task histories are copied column by column.
+    :raises ImportError: if NumPy is not installed.
+    """
+    _require_numpy()
+
+    actor_names, columns = list(), list()
+    for actor in _actors(actors):
+        actor_columns = _actor_columns(actor)
+        actor_names.append(str(actor.logical_name))
+        columns.append(actor_columns)
+
+    lengths = [len(actor_columns[0]) for actor_columns in columns]
+    actor_names = numpy.repeat(numpy.array(actor_names, dtype=str), lengths)
+    entry_point_names = numpy.concatenate(
+        [numpy.array([], dtype=str)] + [numpy.asarray(actor_columns[0], dtype=str) for actor_columns in columns])
+
+    dtype = numpy.dtype([
+        ('actor', actor_names.dtype),
+        ('entry_point_name', entry_point_names.dtype),
+        ('start_tick', numpy.int64),
+        ('finish_tick', numpy.int64),
+        ('depth', numpy.int64),
+        ('parent', numpy.int64)])
+
+    tasks = numpy.empty(sum(lengths), dtype=dtype)
+    if len(tasks) == 0:
+        return tasks
+
+    tasks['actor'] = actor_names
+    tasks['entry_point_name'] = entry_point_names
+    for field, column in (('start_tick', 1), ('finish_tick', 2), ('depth', 3), ('parent', 4)):
+        tasks[field] = numpy.concatenate([numpy.asarray(actor_columns[column], dtype=numpy.int64)
+                                          for actor_columns in columns])
+
+    # Parent indices are made relative to the whole array, rather than to each actor's history.
+    parents = tasks['parent']
+    offsets = numpy.cumsum([0] + lengths[:-1])
+    parents += numpy.where(parents == NONE, 0, numpy.repeat(offsets, lengths))
+
+    return tasks
+
+
+def select_tasks(tasks, actor=None, entry_point_name=None, depth=None, completed=None):
+    """
+    :return: the rows of a task array that match every given criterion.  Each of actor, entry point name and depth may
+    be a single value or a sequence of values.
+    """
+    mask = numpy.ones(len(tasks), dtype=bool)
+    for field, values in (('actor', actor), ('entry_point_name', entry_point_name), ('depth', depth)):
+        if values is not None:
+            mask &= numpy.isin(tasks[field], values)
+    if completed is not None:
+        mask &= (tasks['finish_tick'] != NONE) == completed
+    return tasks[mask]
+
+
+def task_durations(tasks):
+    """
+    :return: an array of the number of ticks taken by each task, or <code>NONE</code> for incomplete tasks.
+    """
+    return numpy.where(tasks['finish_tick'] == NONE, NONE, tasks['finish_tick'] - tasks['start_tick'])
+
+
+def count_tasks_by(tasks, field):
+    """
+    :return: a dictionary of the number of tasks with each value of the field, such as <code>'entry_point_name'</code>.
+    """
+    values, counts = numpy.unique(tasks[field], return_counts=True)
+    return {value.item(): count.item() for value, count in zip(values, counts)}
+
+
+def total_duration_by(tasks, field):
+    """
+    :return: a dictionary of the total number of ticks taken by the completed tasks with each value of the field.
+    """
+    completed_tasks = tasks[tasks['finish_tick'] != NONE]
+    values, inverse = numpy.unique(completed_tasks[field], return_inverse=True)
+    totals = numpy.bincount(inverse, weights=task_durations(completed_tasks), minlength=len(values))
+    return {value.item(): int(total) for value, total in zip(values, totals)}
+
+
+def utilization(tasks, ticks):
+    """
+    :return: a dictionary of the proportion of the given number of ticks that each actor spent performing completed
+    top level tasks.
+    """
+    return {actor: total / ticks for actor, total in total_duration_by(select_tasks(tasks, depth=0), 'actor').items()}
@@ -0,0 +1,175 @@
+import json
+import struct
+
+from threading import Lock
+
+
+class TaskEventLog(object):
+    """
+    An append only sink for the initiation and completion events of the tasks performed by actors, allowing execution
+    traces to be analysed offline rather than retained in memory.  Events are buffered and written to the log's stream
+    in batches.  A single log may be shared by many actors.  Implementing classes encode events by overriding
+    <code>encode_initiation</code> and <code>encode_completion</code>.
+    """
+
+    mode = 'wb'
+
+    def __init__(self, stream, batch_size=4096):
+        """
+        :param stream: a writable file-like object, or the path of a file to create.
+        :param batch_size: the number of events buffered before they are written to the stream.
+        """
+        if isinstance(stream, str):
+            stream = open(stream, self.mode)
+            self._close_stream = True
+        else:
+            self._close_stream = False
+
+        self.stream = stream
+        self.batch_size = batch_size
+
+        self._buffer = list()
+        self._lock = Lock()
+
+    def task_initiated(self, actor, entry_point, tick, depth):
+        with self._lock:
+            self._buffer.append(self.encode_initiation(actor, entry_point, tick, depth))
+            if len(self._buffer) >= self.batch_size:
+                self._write_buffer()
+
+    def task_completed(self, actor, tick, depth):
+        with self._lock:
+            self._buffer.append(self.encode_completion(actor, tick, depth))
+            if len(self._buffer) >= self.batch_size:
+                self._write_buffer()
+
+    def encode_initiation(self, actor, entry_point, tick, depth):
+        """
+        Implementing classes must override this method to encode a task initiation event.  The method is invoked while
+        the log's lock is held.
+        """
+        raise NotImplementedError()
+
+    def encode_completion(self, actor, tick, depth):
+        """
+        Implementing classes must override this method to encode a task completion event.  The method is invoked while
+        the log's lock is held.
+        """
+        raise NotImplementedError()
+
+    def _write_buffer(self):
+        if len(self._buffer) > 0:
+            self.stream.write(self._buffer[0][0:0].join(self._buffer))
+            self._buffer.clear()
+
+    def flush(self):
+        with self._lock:
+            self._write_buffer()
+            self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self._close_stream:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JsonLinesTaskEventLog(TaskEventLog):
+    """
+    Writes task events as lines of JSON to a text stream, for example:
+
+        {"actor": "alice", "event": "initiated", "task": "wash", "tick": 3, "depth": 0}
+        {"actor": "alice", "event": "completed", "tick": 4, "depth": 0}
+
+    A completion event closes the most recently initiated open task of the same actor at the same depth.
+    """
+
+    mode = 'w'
+
+    def encode_initiation(self, actor, entry_point, tick, depth):
+        return json.dumps({
+            'actor': actor.logical_name, 'event': 'initiated', 'task': entry_point.__name__, 'tick': tick,
+            'depth': depth}) + '\n'
+
+    def encode_completion(self, actor, tick, depth):
+        return json.dumps({'actor': actor.logical_name, 'event': 'completed', 'tick': tick, 'depth': depth}) + '\n'
+
+
+class BinaryTaskEventLog(TaskEventLog):
+    """
+    Writes task events as fixed size binary records to a binary stream.  Actor names and entry point names are written
+    once, as definition records, and are subsequently referred to by number.  Logs can be read back with
+    <code>read_binary_task_events</code>.
+    """
+
+    INITIATED = 0
+    COMPLETED = 1
+    ACTOR_DEFINITION = 2
+    ENTRY_POINT_DEFINITION = 3
+
+    EVENT = struct.Struct('<BIIqI')
+    DEFINITION = struct.Struct('<BII')
+
+    def __init__(self, stream, batch_size=4096):
+        super(BinaryTaskEventLog, self).__init__(stream, batch_size)
+        self._actor_ids = dict()
+        self._entry_point_ids = dict()
+
+    def _definition_id(self, ids, key, name, record_type):
+        definition_id = ids.get(key)
+        if definition_id is None:
+            definition_id = len(ids)
+            ids[key] = definition_id
+            encoded_name = str(name).encode('utf-8')
+            # Definitions are buffered ahead of the event that refers to them.
+            self._buffer.append(
+                BinaryTaskEventLog.DEFINITION.pack(record_type, definition_id, len(encoded_name)) + encoded_name)
+        return definition_id
+
+    def encode_initiation(self, actor, entry_point, tick, depth):
+        actor_id = self._definition_id(
+            self._actor_ids, actor, actor.logical_name, BinaryTaskEventLog.ACTOR_DEFINITION)
+        entry_point_id = self._definition_id(
+            self._entry_point_ids, getattr(entry_point, '__func__', entry_point), entry_point.__name__,
+            BinaryTaskEventLog.ENTRY_POINT_DEFINITION)
+        return BinaryTaskEventLog.EVENT.pack(BinaryTaskEventLog.INITIATED, actor_id, entry_point_id, tick, depth)
+
+    def encode_completion(self, actor, tick, depth):
+        actor_id = self._definition_id(
+            self._actor_ids, actor, actor.logical_name, BinaryTaskEventLog.ACTOR_DEFINITION)
+        return BinaryTaskEventLog.EVENT.pack(BinaryTaskEventLog.COMPLETED, actor_id, 0, tick, depth)
+
+
+def read_binary_task_events(stream):
+    """
+    Reads the events written by a <code>BinaryTaskEventLog</code>.
+    :param stream: a readable binary file-like object.
+    :return: a generator of (event, actor name, entry point name, tick, depth) tuples, where event is either
+    'initiated' or 'completed', and the entry point name of completion events is None.
+    """
+    actor_names = dict()
+    entry_point_names = dict()
+
+    while True:
+        record_type = stream.read(1)
+        if len(record_type) == 0:
+            return
+
+        if record_type[0] in (BinaryTaskEventLog.ACTOR_DEFINITION, BinaryTaskEventLog.ENTRY_POINT_DEFINITION):
+            _, definition_id, length = BinaryTaskEventLog.DEFINITION.unpack(
+                record_type + stream.read(BinaryTaskEventLog.DEFINITION.size - 1))
+            names = actor_names if record_type[0] == BinaryTaskEventLog.ACTOR_DEFINITION else entry_point_names
+            names[definition_id] = stream.read(length).decode('utf-8')
+
+        else:
+            event, actor_id, entry_point_id, tick, depth = BinaryTaskEventLog.EVENT.unpack(
+                record_type + stream.read(BinaryTaskEventLog.EVENT.size - 1))
+            if event == BinaryTaskEventLog.INITIATED:
+                yield 'initiated', actor_names[actor_id], entry_point_names[entry_point_id], tick, depth
+            else:
+                yield 'completed', actor_names[actor_id], None, tick, depth
@@ -0,0 +1,126 @@
+import sys
+import traceback
+
+from collections import deque
+from threading import Condition, current_thread, Event, Lock, Thread
+
+
+class _PooledThread(object):
+    """
+    Stands in for the thread of an actor performed by an <code>ActorThreadCache</code>, with the parts of the interface
+    of <code>threading.Thread</code> used to start, observe and join the actor's performance.
+    """
+
+    def __init__(self, cache, actor):
+        self.cache = cache
+        self.actor = actor
+        self._started = False
+        self._finished = Event()
+
+    def start(self):
+        if self._started:
+            raise RuntimeError("The performance of actor [%s] can only be started once." % self.actor.logical_name)
+        self._started = True
+        self.cache._submit(self)
+
+    def is_alive(self):
+        return self._started and not self._finished.is_set()
+
+    def join(self, timeout=None):
+        if not self._started:
+            raise RuntimeError("Cannot join the performance of actor [%s] before it is started." %
+                               self.actor.logical_name)
+        self._finished.wait(timeout)
+
+    def run(self, worker):
+        worker.actor = self.actor
+        try:
+            self.actor.perform()
+        except BaseException:
+            print("Warning, actor [%s] ended with an exception." % self.actor.logical_name, file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            worker.actor = None
+            self._finished.set()
+
+
+class ActorThreadCache(object):
+    """
+    A cache of threads for threaded actors, so that the threads of short lived actors (for example, those added to an
+    improvisation) are reused rather than created and torn down for each actor.  The cache does not bound the number
+    of threads or share a thread between actors: each actor occupies a worker for the whole of its performance, as an
+    actor blocked waiting for its turn holds the stack of its thread, and casts that need many actors on few threads
+    should use asynchronous actors instead.  A new worker is created whenever an actor is started while every worker is
+    busy, and up to <code>max_idle_workers</code> workers are kept waiting for further actors once their actors have
+    shut down.  Workers are daemon threads, so the actors of a cache should be waited for (for example with
+    <code>Cast.wait_for_shutdown</code>) before a program ends.
+    """
+
+    def __init__(self, max_idle_workers=32):
+        self.max_idle_workers = max_idle_workers
+
+        self._lock = Lock()
+        self._available = Condition(self._lock)
+        self._pending = deque()
+        self._idle_workers = 0
+        self._workers = 0
+        self._closed = False
+
+    @property
+    def workers(self):
+        """
+        The number of worker threads, busy or idle.
+        """
+        return self._workers
+
+    def start(self, actor):
+        """
+        Starts the performance of the actor on a worker of the cache.  Asynchronous actors, which do not have threads,
+        are started as normal.
+        """
+        if getattr(actor, 'thread', None) is None:
+            actor.start()
+            return
+
+        if not isinstance(actor.thread, _PooledThread) and actor.thread.ident is None:
+            actor.thread = _PooledThread(self, actor)
+        actor.start()
+
+    def _submit(self, pooled_thread):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Actor thread cache has been shut down.")
+            self._pending.append(pooled_thread)
+            if self._idle_workers >= len(self._pending):
+                self._available.notify()
+                return
+            self._workers += 1
+
+        Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        worker = current_thread()
+        while True:
+            with self._lock:
+                while len(self._pending) == 0:
+                    if self._closed or self._idle_workers >= self.max_idle_workers:
+                        self._workers -= 1
+                        return
+                    self._idle_workers += 1
+                    self._available.wait()
+                    self._idle_workers -= 1
+                pooled_thread = self._pending.popleft()
+
+            pooled_thread.run(worker)
+            # The idle worker does not keep the actor it last performed alive.
+            pooled_thread = None
+
+    def shutdown(self):
+        """
+        Ends the idle workers of the cache.  Actors already started continue to be performed, but no further actors can
+        be started.
+        """
+        with self._lock:
+            self._closed = True
+            self._available.notify_all()
+
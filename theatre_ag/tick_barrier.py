@@ -0,0 +1,221 @@
+import asyncio
+
+from heapq import heappop, heappush
+from threading import Condition, Lock
+
+
+class TickBarrier(object):
+    """
+    Synchronizes a changing set of parties (typically actors) on the ticks of a clock.  Each party arrives at the
+    barrier when it is ready for the next tick and is suspended until the clock releases the barrier.  The barrier keeps
+    a single count of arrivals, so that the clock is woken once when the last party arrives, and all waiting parties are
+    woken together by a single broadcast when the barrier is released.
+
+    A party that identifies itself on arrival instead sleeps until the barrier is released at or after its
+    <code>next_turn</code>.  Sleeping parties are kept in a heap of their wake ticks, count as arrived on every tick
+    before then, and are each woken individually, so that parties waiting for a distant turn are not woken on each tick.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._all_arrived = Condition(self._lock)
+        self._released = Condition(self._lock)
+
+        self._parties = set()
+        self._arrived = 0
+        self._generation = 0
+        self._closed = False
+
+        self._wake_ticks = dict()
+        self._wake_heap = list()
+        self._wake_sequence = 0
+        self._wake_conditions = dict()
+
+    @property
+    def parties(self):
+        with self._lock:
+            return tuple(self._parties)
+
+    def register(self, party):
+        with self._lock:
+            self._parties.add(party)
+
+    def deregister(self, party):
+        with self._lock:
+            self._parties.discard(party)
+            self._wake_conditions.pop(party, None)
+            if self._all_parties_arrived():
+                self._all_arrived.notify()
+
+    def _all_parties_arrived(self):
+        return self._arrived + len(self._wake_ticks) >= len(self._parties)
+
+    def reschedule(self, party):
+        """
+        Invoked when the next turn of a waiting party is brought forward, so that a sleeping party is woken at its new
+        turn.
+        """
+        with self._lock:
+            wake_tick = self._wake_ticks.get(party)
+            if wake_tick is not None and party.next_turn < wake_tick:
+                self._schedule_wake(party, party.next_turn)
+
+    def _schedule_wake(self, party, wake_tick):
+        self._wake_ticks[party] = wake_tick
+        if wake_tick != float('inf'):
+            heappush(self._wake_heap, (wake_tick, self._wake_sequence, party))
+            self._wake_sequence += 1
+
+    def arrive(self, party=None):
+        """
+        Records the arrival of a party at the barrier and blocks until the barrier is next released or closed.  If the
+        party is given, it instead blocks until the barrier is released at or after the party's next turn, or closed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            if party is None:
+                generation = self._generation
+                self._arrived += 1
+                if self._all_parties_arrived():
+                    self._all_arrived.notify()
+                while generation == self._generation:
+                    self._released.wait()
+                return
+
+            wake_condition = self._wake_conditions.get(party)
+            if wake_condition is None:
+                wake_condition = self._wake_conditions[party] = Condition(self._lock)
+
+            self._schedule_wake(party, party.next_turn)
+            if self._all_parties_arrived():
+                self._all_arrived.notify()
+            while party in self._wake_ticks:
+                wake_condition.wait()
+
+    def wait_for_arrivals(self):
+        """
+        Blocks until every registered party has arrived at the barrier.
+        """
+        with self._lock:
+            while not self._all_parties_arrived() and not self._closed:
+                self._all_arrived.wait()
+
+    def release(self, tick=None):
+        """
+        Wakes all the parties waiting at the barrier for the next tick with a single broadcast, and resets the count of
+        arrivals for the next tick.  Sleeping parties whose next turns are due by the given tick are woken individually.
+        :param tick: the tick being issued, or None to wake every sleeping party, as when no further ticks will be
+        issued.
+        """
+        with self._lock:
+            self._arrived = 0
+            self._generation += 1
+            self._released.notify_all()
+
+            if tick is None:
+                self._wake_all()
+                return
+
+            wake_heap = self._wake_heap
+            while len(wake_heap) > 0 and wake_heap[0][0] <= tick:
+                wake_tick, _, party = heappop(wake_heap)
+                if self._wake_ticks.get(party) == wake_tick:
+                    del self._wake_ticks[party]
+                    self._wake_conditions[party].notify()
+
+    def _wake_all(self):
+        for party in self._wake_ticks:
+            self._wake_conditions[party].notify()
+        self._wake_ticks.clear()
+        self._wake_heap = list()
+
+    def close(self):
+        """
+        Releases all waiting parties and prevents any further waiting at the barrier.
+        """
+        with self._lock:
+            self._closed = True
+            self._arrived = 0
+            self._generation += 1
+            self._released.notify_all()
+            self._wake_all()
+            self._all_arrived.notify()
+
+
+class AsyncTickBarrier(object):
+    """
+    The asyncio counterpart of <code>TickBarrier</code>, for parties implemented as tasks on a single event loop.  All
+    parties waiting for a tick await the same future, which is resolved once when the barrier is released.  The barrier
+    must only be used from the thread running its event loop.
+    """
+
+    def __init__(self):
+        self._parties = set()
+        self._arrived = 0
+        self._released = None
+        self._all_arrived = None
+        self._closed = False
+
+    @property
+    def parties(self):
+        return tuple(self._parties)
+
+    def register(self, party):
+        self._parties.add(party)
+
+    def deregister(self, party):
+        self._parties.discard(party)
+        self._check_arrivals()
+
+    def reschedule(self, party):
+        """
+        See <code>TickBarrier.reschedule</code>.
+        """
+        pass
+
+    def _check_arrivals(self):
+        if self._all_arrived is not None and self._arrived >= len(self._parties) and not self._all_arrived.done():
+            self._all_arrived.set_result(None)
+
+    async def arrive(self):
+        """
+        Records the arrival of a party at the barrier and suspends until the barrier is next released or closed.
+        """
+        if self._closed:
+            return
+        if self._released is None:
+            self._released = asyncio.get_running_loop().create_future()
+        released = self._released
+        self._arrived += 1
+        self._check_arrivals()
+        await released
+
+    async def wait_for_arrivals(self):
+        """
+        Suspends until every registered party has arrived at the barrier.
+        """
+        while self._arrived < len(self._parties) and not self._closed:
+            self._all_arrived = asyncio.get_running_loop().create_future()
+            await self._all_arrived
+        self._all_arrived = None
+
+    def release(self):
+        """
+        Resumes all the parties waiting at the barrier by resolving their shared future, and resets the count of
+        arrivals for the next tick.
+        """
+        self._arrived = 0
+        released = self._released
+        self._released = None
+        if released is not None:
+            released.set_result(None)
+
+    def close(self):
+        """
+        Releases all waiting parties and prevents any further waiting at the barrier.
+        """
+        self._closed = True
+        self.release()
+        self._check_arrivals()
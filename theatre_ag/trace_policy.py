@@ -0,0 +1,40 @@
+import random
+
+
+class TracePolicy(object):
+    """
+    Decides which of the workflow method calls made while an actor performs a task are recorded as sub tasks in the
+    actor's task history.  A call that is not traced, and every call made within it, is performed and timed as normal,
+    but is not recorded, counted or streamed to the actor's task event log.  Top level tasks are always traced.
+
+    A policy applies to the calls made by an actor (as its <code>trace_policy</code> attribute), to the calls of the
+    methods of a workflow (as the workflow's <code>trace_policy</code> attribute) or to the calls of a single method
+    (through the <code>trace_with</code> annotation).  The policy of a method takes precedence over that of its
+    workflow, which takes precedence over that of the actor.
+    :param max_depth: if given, calls nested more deeply than this below the top level task are not traced, so that a
+    maximum depth of 1 traces the calls made directly by top level tasks only.
+    :param excluded: methods, or method names, whose calls are not traced.
+    :param sample_rate: the proportion of calls that are traced, chosen at random.
+    :param seed: the seed for the random choice of sampled calls.
+    """
+
+    def __init__(self, max_depth=None, excluded=(), sample_rate=1.0, seed=None):
+        self.max_depth = max_depth
+        self.excluded_names = {method for method in excluded if isinstance(method, str)}
+        self.excluded_methods = {getattr(method, '__wrapped__', method) for method in excluded
+                                 if not isinstance(method, str)}
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+
+    def traces(self, entry_point, depth):
+        """
+        :param entry_point: the method being called.
+        :param depth: the depth at which the call would be recorded, where top level tasks have a depth of 0.
+        :return: True if the call should be recorded.
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if getattr(entry_point, '__func__', entry_point) in self.excluded_methods or \
+                entry_point.__name__ in self.excluded_names:
+            return False
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
@@ -1,7 +1,44 @@
+import functools
 import inspect
 
 import threading
 
+from contextvars import ContextVar
+from types import MethodType
+
+
+_current_actor = ContextVar('current_actor', default=None)
+
+
+class OutOfTurnsException(Exception):
+    """
+    Raised when a theatre actor's task persists beyond the actor's clock's maximum tick.
+    """
+
+    def __init__(self, actor):
+        self.actor = actor
+
+    def __str__(self):
+        return self.actor.logical_name, "out of turns after", self.actor.clock.current_tick, "ticks."
+
+
+def current_actor():
+    """
+    :return: the actor performing workflows in the current thread or asyncio task, or None if there is no such actor.
+    """
+    actor = _current_actor.get()
+    if actor is None:
+        actor = getattr(threading.current_thread(), 'actor', None)
+    return actor
+
+
+def set_current_actor(actor):
+    """
+    Associates the specified actor with the current thread or asyncio task, so that workflow methods invoked in the same
+    context are synchronized with the actor's clock.
+    """
+    _current_actor.set(actor)
+
 
 def default_cost(cost=0):
     def workflow_decorator(func):
@@ -10,87 +47,198 @@ def default_cost(cost=0):
     return workflow_decorator
 
 
+def cost_function(function, memoize=True):
+    """
+    Annotates a workflow method with a function that calculates its cost, invoked as
+    <code>function(workflow, *args)</code> with the workflow and arguments of each invocation of the method.  Unless
+    memoize is False, the cost is only calculated once for each distinct workflow and arguments.
+    """
+    def workflow_decorator(func):
+        func.cost_function = function
+        func.memoize_cost = memoize
+        return func
+    return workflow_decorator
+
+
+def trace_with(policy):
+    """
+    Annotates a workflow method with the <code>TracePolicy</code> that decides which of its calls are recorded in the
+    task histories of actors, overriding the trace policies of its workflow and of the actor.
+    """
+    def workflow_decorator(func):
+        func.trace_policy = policy
+        return func
+    return workflow_decorator
+
+
 def allocate_workflow_to(actor, workflow, logging=True):
     """
     Allocates the workflow to the specified actor for timing synchronization purposes.  The members of the workflow are
     recursively inspected.  Any member with the class attribute 'is_workflow' is also allocated to this actor if it has
-    not previously been allocated to another actor.
+    not previously been allocated to another actor.  A workflow that is already allocated to the actor is not inspected
+    again, so nested workflows assigned to it after its allocation must be allocated explicitly.  The class of the
+    workflow is always treated as a workflow class, even if the workflow was allocated in another process.
     """
+    workflow_class = workflow.__class__
+    treated = '_is_tracked_workflow' in vars(workflow_class)
+
+    if treated and getattr(workflow, 'actor', None) is actor and getattr(workflow, 'logging', None) is logging:
+        return
+
     workflow.logging = logging
     workflow.actor = actor
 
-    workflow_class = workflow.__class__
-
-    if not workflow_class.__getattribute__.__name__ == '__tracked_getattribute':
+    if not treated:
         treat_as_workflow(workflow_class)
 
-    for name, member in inspect.getmembers(workflow):
+    nested_workflows = list()
+
+    for name, member in list(vars(workflow).items()):
+        if _is_task_function(name, member):
+            setattr(workflow, name, _synchronize(member, bound_workflow=workflow))
+        elif hasattr(member.__class__, 'is_workflow'):
+            nested_workflows.append(member)
+
+    for name in _class_workflow_member_names(workflow):
+        nested_workflows.append(getattr(workflow, name))
+
+    for member in nested_workflows:
         if hasattr(member.__class__, 'is_workflow'):
             allocate_workflow_to(actor, member, logging)
 
 
+def _class_workflow_member_names(workflow):
+    """
+    :return: the names of the members of the workflow's class (such as properties) that were found to hold nested
+    workflows when the first instance of the class was allocated.  The names are cached on the class, so that the members
+    of the class are only inspected once.
+    """
+    workflow_class = workflow.__class__
+    names = vars(workflow_class).get('_workflow_member_names')
+    if names is None:
+        instance_attributes = vars(workflow)
+        names = tuple(
+            name for name, member in inspect.getmembers(workflow)
+            if name not in instance_attributes and hasattr(member.__class__, 'is_workflow'))
+        workflow_class._workflow_member_names = names
+    return names
+
+
 def treat_as_workflow(workflow_class):
     """
-    Modifies the specified class to intercept __getattribute__ calls for task methods of a workflow, and synchronise
-    their execution with an actor.  The underlying 'reference' __getattribute__ method is retained and used to access
-    the underlying workflow task method for execution within the synchronization machinery.
+    Modifies the specified class so that the execution of its task methods is synchronised with the actor performing
+    them.  Each task method defined by the class or inherited from its ancestors is replaced on the class, once, by a
+    synchronizing wrapper that retains a reference to the underlying method (as <code>__wrapped__</code>) and is marked
+    as <code>synchronized</code>.  Access to other attributes of the workflow is unaffected.  Static methods, class
+    methods and methods added to the class after it has been treated are not synchronized.
     """
+    synchronized = set()
 
-    reference_get_attr = workflow_class.__getattribute__
+    for ancestor in workflow_class.__mro__[:-1]:
+        for name, member in list(vars(ancestor).items()):
+            if name in synchronized or not _is_task_function(name, member):
+                continue
+            synchronized.add(name)
+            setattr(workflow_class, name, _synchronize(member))
 
-    def __tracked_getattribute(self, item):
+    workflow_class._is_tracked_workflow = True
 
-        attribute = reference_get_attr(self, item)
 
-        if hasattr(attribute, '__func__') and attribute.__func__.__name__[0:2] == '__':
-            return attribute
+def _is_task_function(name, member):
+    return inspect.isfunction(member) and not name.startswith('__') and not member.__name__.startswith('__') \
+        and not getattr(member, 'synchronized', False)
 
-        elif inspect.ismethod(attribute) or inspect.isfunction(attribute):
-            def sync_wrap(*args, **kwargs):
-                current_thread = threading.current_thread()
-                if hasattr(current_thread, 'actor'):
-                    actor = current_thread.actor
-                    actor.busy.acquire()
-                    actor.log_task_initiation(attribute, self, args)
 
-                    # TODO Pass function name and indicative cost to a cost calculation function.
+def _synchronize(func, bound_workflow=None):
+    """
+    Creates a wrapper for a workflow task function that synchronizes each invocation with the current actor's clock.
+    Unless a bound workflow is given, the wrapper expects the workflow instance as its first argument, as for a method,
+    and the actor is passed the function bound to the workflow as the entry point of the task.
+    """
 
-                    actor.incur_delay(attribute, self, args)
-                    actor.wait_for_turn()
+    if inspect.iscoroutinefunction(func):
+        async def async_sync_wrap(*args, **kwargs):
+            workflow, task_args = (bound_workflow, args) if bound_workflow is not None else (args[0], args[1:])
+            actor = current_actor()
+            if actor is not None:
+                entry_point = func if bound_workflow is not None else MethodType(func, workflow)
+                actor.log_task_initiation(entry_point, workflow, task_args)
+                actor.incur_delay(entry_point, workflow, task_args)
+                await actor.wait_for_turn_async()
 
-                    try:
-                        return attribute.__func__(self, *args, **kwargs) if inspect.ismethod(attribute) \
-                            else attribute(*args, **kwargs)
-                    finally:
+                completed = True
+                try:
+                    return await func(*args, **kwargs)
+                except OutOfTurnsException:
+                    completed = False
+                    raise
+                finally:
+                    if completed:
                         actor.log_task_completion()
-                        actor.busy.release()
-                else:
-                    return attribute.__func__(self, *args, **kwargs)
-
-            if inspect.ismethod(attribute):
-                sync_wrap.__name__ = attribute.__func__.__name__
             else:
-                sync_wrap.__name__ = attribute.__name__
+                return await func(*args, **kwargs)
+
+        async_sync_wrap = functools.wraps(func)(async_sync_wrap)
+        async_sync_wrap.synchronized = True
+        return async_sync_wrap
+
+    def sync_wrap(*args, **kwargs):
+        workflow, task_args = (bound_workflow, args) if bound_workflow is not None else (args[0], args[1:])
+        actor = current_actor()
+        if actor is not None:
+            actor.busy.acquire()
+            entry_point = func if bound_workflow is not None else MethodType(func, workflow)
+            actor.log_task_initiation(entry_point, workflow, task_args)
 
-            return sync_wrap
+            actor.incur_delay(entry_point, workflow, task_args)
+            actor.wait_for_turn()
 
+            completed = True
+            try:
+                return func(*args, **kwargs)
+            except OutOfTurnsException:
+                # A task interrupted by the clock running out of ticks is left incomplete.
+                completed = False
+                raise
+            finally:
+                if completed:
+                    actor.log_task_completion()
+                actor.busy.release()
         else:
-            return attribute
+            return func(*args, **kwargs)
 
-    workflow_class.__getattribute__ = __tracked_getattribute
+    sync_wrap = functools.wraps(func)(sync_wrap)
+    sync_wrap.synchronized = True
+    return sync_wrap
+
+
+def _actor_waiting_for(task):
+    """
+    :return: the current actor, or None if there is no current actor and the task has already been completed.
+    :raises RuntimeError: if there is no current actor and the task is incomplete, as nothing could complete the task
+    while the current thread waits for it.
+    """
+    actor = current_actor()
+    if actor is None and not task.completed:
+        raise RuntimeError("Cannot idle until incomplete task [%s] outside the performance of an actor." % task)
+    return actor
 
 
 class Idling(object):
     """
-    A workflow that allows an actor to waste a turn.
+    A workflow that allows an actor to waste a turn.  Idling for a duration incurs a single delay, and idling until a
+    task is completed suspends the actor until the task's completion is notified, rather than idling on every tick.
+    Parking suspends a <code>TaskQueueActor</code> until it is allocated a task.  Outside the performance of an actor,
+    idling and parking do nothing, and idling until an incomplete task raises a <code>RuntimeError</code>.
     """
 
     is_workflow = True
 
     @default_cost(0)
     def idle_for(self, duration):
-        for _ in range(0, duration):
-            self.idle()
+        actor = current_actor()
+        if actor is not None:
+            actor.wait_for_ticks(duration)
 
     @default_cost(0)
     def wait_for_tasks(self, allocated_tasks):
@@ -99,9 +247,52 @@ class Idling(object):
 
     @default_cost(0)
     def idle_until(self, allocated_task):
-        while not allocated_task.completed:
-            self.idle()
+        actor = _actor_waiting_for(allocated_task)
+        if actor is not None:
+            actor.wait_for_task(allocated_task)
+
+    @default_cost(0)
+    def park(self):
+        actor = current_actor()
+        if actor is not None:
+            actor.park()
 
     @default_cost(1)
     def idle(self):
         pass
+
+
+class AsyncIdling(object):
+    """
+    A workflow that allows an asynchronous actor to waste a turn.  The methods of this workflow must be awaited, and
+    behave as those of <code>Idling</code> outside the performance of an actor.
+    """
+
+    is_workflow = True
+
+    @default_cost(0)
+    async def idle_for(self, duration):
+        actor = current_actor()
+        if actor is not None:
+            await actor.wait_for_ticks_async(duration)
+
+    @default_cost(0)
+    async def wait_for_tasks(self, allocated_tasks):
+        for task in allocated_tasks:
+            await self.idle_until(task)
+
+    @default_cost(0)
+    async def idle_until(self, allocated_task):
+        actor = _actor_waiting_for(allocated_task)
+        if actor is not None:
+            await actor.wait_for_task_async(allocated_task)
+
+    @default_cost(0)
+    async def park(self):
+        actor = current_actor()
+        if actor is not None:
+            await actor.park_async()
+
+    @default_cost(1)
+    async def idle(self):
+        pass